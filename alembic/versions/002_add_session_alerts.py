@@ -0,0 +1,26 @@
+"""add alert thresholds to sessions
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("alert_balance", sa.Float(), nullable=True))
+    op.add_column("sessions", sa.Column("alert_expire_days", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "alert_expire_days")
+    op.drop_column("sessions", "alert_balance")
@@ -0,0 +1,23 @@
+"""index sessions.created_at
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_created_at", "sessions", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_created_at", table_name="sessions")
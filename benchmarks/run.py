@@ -0,0 +1,370 @@
+"""
+Микробенчмарки путей, которые выполняются на каждое обновление.
+
+Результаты пишутся в JSON и сравниваются с сохранённым baseline
+(benchmarks/baseline.json): замедление сверх порога считается
+регрессией, и скрипт завершается с кодом 1 — это можно вызывать
+перед деплоем. Кейсы locale.legacy.* замеряют прежний поиск по
+вложенным словарям для сравнения с плоскими таблицами LocaleService.
+
+Запуск:
+    python benchmarks/run.py                      # прогон и сравнение с baseline
+    python benchmarks/run.py --save-baseline      # сохранить текущие результаты как baseline
+    python benchmarks/run.py -k middleware        # только кейсы, в имени которых есть подстрока
+
+БД не нужна: middleware работают с подменённой in-memory сессией БД.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+# Settings требует эти переменные; соединения при импорте не открываются
+os.environ.setdefault("BOT_TOKEN", "42:bench")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@localhost/bench")
+os.environ.setdefault("UBILLING_URL", "http://localhost/billing")
+
+from aiogram.dispatcher.event.handler import HandlerObject  # noqa: E402
+from aiogram.types import Chat, Message, User  # noqa: E402
+
+from bot.db import Session, session_cache  # noqa: E402
+from bot.handlers.start import _parse_deeplink  # noqa: E402
+from bot.i18n import LocaleService  # noqa: E402
+from bot.keyboards import (  # noqa: E402
+    main_menu_keyboard,
+    pagination_keyboard,
+    payment_systems_keyboard,
+)
+from bot.middlewares import AuthMiddleware, LocaleMiddleware  # noqa: E402
+from bot.utils.formatting import format_full_user_info, format_user_info  # noqa: E402
+from bot.utils.pagination import paginate  # noqa: E402
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results.json"
+REPEAT = 5
+MIN_TIME = 0.2
+
+USER_ID = 42
+
+# Ключ, который удаляется из en для кейсов fallback: в файлах локалей
+# одинаковый набор ключей, и без этого fallback не выполняется
+FALLBACK_LOCALE, FALLBACK_KEY = "en", "menu.balance"
+
+
+class FakeResult:
+    """Результат запроса, достаточный для get_session()."""
+
+    def __init__(self, row: Any) -> None:
+        self._row = row
+
+    def scalar_one_or_none(self) -> Any:
+        return self._row
+
+
+class FakeDB:
+    """In-memory замена AsyncSession: отвечает на select(Session) по telegram_id."""
+
+    def __init__(self, rows: dict[int, Session]) -> None:
+        self._rows = rows
+
+    async def __aenter__(self) -> "FakeDB":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, stmt: Any) -> FakeResult:
+        # select(Session).where(Session.telegram_id == telegram_id)
+        telegram_id = stmt.whereclause.right.value
+        return FakeResult(self._rows.get(telegram_id))
+
+
+def _install_fake_db() -> None:
+    """Подменяет sessionmaker'ы get_session() на in-memory БД."""
+    rows = {
+        USER_ID: Session(
+            telegram_id=USER_ID,
+            login="bench_user",
+            password_md5="0" * 32,
+            locale="uk",
+            created_at=datetime.now(UTC),
+        )
+    }
+    # bot.db.session_cache как атрибут пакета — это экземпляр кэша, модуль берём из sys.modules
+    module = sys.modules["bot.db.session_cache"]
+    module.async_session = lambda: FakeDB(rows)
+    module.async_read_session = lambda: FakeDB(rows)
+
+
+def legacy_get(
+    data: dict[str, dict[str, Any]], default: str, locale: str, key: str, **kwargs: Any
+) -> str:
+    """Реализация LocaleService.get до перехода на плоские таблицы."""
+    section: Any = data.get(locale) or data.get(default, {})
+    for part in key.split("."):
+        if isinstance(section, dict):
+            section = section.get(part)
+        else:
+            section = None
+            break
+
+    if section is None:
+        if locale != default:
+            return legacy_get(data, default, default, key, **kwargs)
+        return key
+
+    if kwargs:
+        try:
+            return str(section).format(**kwargs)
+        except KeyError:
+            return str(section)
+
+    return str(section)
+
+
+def _fallback_locale_service() -> LocaleService:
+    """LocaleService, в котором FALLBACK_KEY есть только в локали по умолчанию."""
+    service = LocaleService(ROOT / "locales", "uk")
+    service.load()
+    section, _, name = FALLBACK_KEY.rpartition(".")
+    del service._data[FALLBACK_LOCALE][section][name]
+    service._compile()
+    assert service.get(FALLBACK_LOCALE, FALLBACK_KEY) == service.get("uk", FALLBACK_KEY)
+    return service
+
+
+def _message(text: str = "/menu") -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.now(UTC),
+        chat=Chat(id=USER_ID, type="private"),
+        from_user=User(id=USER_ID, is_bot=False, first_name="Bench", language_code="uk"),
+        text=text,
+    )
+
+
+async def _handler_with_session(
+    message: Message, login: str, password_md5: str, session: Session
+) -> None:
+    """Обработчик, которому нужна сессия: middleware идут в кэш/БД."""
+
+
+async def _handler_without_session(message: Message) -> None:
+    """Обработчик без сессии: middleware обходятся кэшем локали."""
+
+
+async def _next_handler(event: Any, data: dict[str, Any]) -> None:
+    return None
+
+
+def build_cases() -> dict[str, tuple[Callable[[], Any], bool]]:
+    """Собирает кейсы: {имя: (функция, асинхронная ли)}."""
+    locale_service = LocaleService(ROOT / "locales", "uk")
+    locale_service.load()
+    t = locale_service.translator("uk")
+    fallback_service = _fallback_locale_service()
+    legacy_data = fallback_service._data
+
+    user = SimpleNamespace(
+        realname="Іван Петренко",
+        address="вул. Шевченка, 1, кв. 2",
+        phone="0441234567",
+        mobile="0671234567",
+        email="user@example.com",
+        contract="12345",
+        pay_id="987654",
+        tariff_name="Home-100",
+        cash="150.25",
+        currency="грн",
+        credit=0,
+        credit_expire=None,
+        account_state="active",
+        account_expire="2026-12-31",
+        ip="10.0.0.2",
+        traffic_download="1024 MB",
+        traffic_upload="256 MB",
+        traffic_total="1280 MB",
+    )
+    items = list(range(10_000))
+    systems = [(f"Система {i}", f"https://pay.example.com/{i}") for i in range(8)]
+
+    _install_fake_db()
+    message = _message()
+    locale_middleware = LocaleMiddleware(locale_service)
+    auth_middleware = AuthMiddleware()
+    with_session = HandlerObject(_handler_with_session)
+    without_session = HandlerObject(_handler_without_session)
+
+    def middleware_case(
+        middleware: Any, handler: HandlerObject, cold: bool
+    ) -> Callable[[], Awaitable[None]]:
+        async def run() -> None:
+            if cold:
+                session_cache.clear()
+            await middleware(_next_handler, message, {"handler": handler})
+
+        return run
+
+    return {
+        "locale.get.plain": (lambda: locale_service.get("uk", "menu.balance"), False),
+        "locale.get.kwargs": (
+            lambda: locale_service.get("uk", "info.balance", cash="100.50", currency="грн"),
+            False,
+        ),
+        "locale.get.fallback": (
+            lambda: fallback_service.get(FALLBACK_LOCALE, FALLBACK_KEY),
+            False,
+        ),
+        "locale.get.missing": (lambda: locale_service.get("en", "menu.missing_key"), False),
+        "locale.legacy.plain": (
+            lambda: legacy_get(legacy_data, "uk", "uk", "menu.balance"),
+            False,
+        ),
+        "locale.legacy.kwargs": (
+            lambda: legacy_get(
+                legacy_data, "uk", "uk", "info.balance", cash="100.50", currency="грн"
+            ),
+            False,
+        ),
+        "locale.legacy.fallback": (
+            lambda: legacy_get(legacy_data, "uk", FALLBACK_LOCALE, FALLBACK_KEY),
+            False,
+        ),
+        "formatting.user_info": (lambda: format_user_info(t, user), False),
+        "formatting.full_user_info": (lambda: format_full_user_info(t, user), False),
+        "paginate.10k.first": (lambda: paginate(items, 1), False),
+        "paginate.10k.last": (lambda: paginate(items, 1000), False),
+        "keyboards.main_menu.cached": (lambda: main_menu_keyboard(t), False),
+        "keyboards.main_menu.build": (lambda: main_menu_keyboard.__wrapped__(t), False),
+        "keyboards.pagination": (
+            lambda: pagination_keyboard(t, "payments", 5, 100, "payments"),
+            False,
+        ),
+        "keyboards.payment_systems": (lambda: payment_systems_keyboard(t, systems), False),
+        "start.parse_deeplink.valid": (
+            lambda: _parse_deeplink("bench_user-0123456789abcdef0123456789abcdef"),
+            False,
+        ),
+        "start.parse_deeplink.invalid": (lambda: _parse_deeplink("garbage"), False),
+        "middleware.locale.cached": (
+            middleware_case(locale_middleware, with_session, cold=False),
+            True,
+        ),
+        "middleware.locale.db": (middleware_case(locale_middleware, with_session, cold=True), True),
+        "middleware.locale.no_session": (
+            middleware_case(locale_middleware, without_session, cold=False),
+            True,
+        ),
+        "middleware.auth.cached": (
+            middleware_case(auth_middleware, with_session, cold=False),
+            True,
+        ),
+        "middleware.auth.db": (middleware_case(auth_middleware, with_session, cold=True), True),
+    }
+
+
+def measure(func: Callable[[], Any], is_async: bool) -> float:
+    """Время одного вызова в наносекундах: минимум из REPEAT прогонов."""
+    if is_async:
+        loop = asyncio.new_event_loop()
+
+        async def batch(number: int) -> None:
+            for _ in range(number):
+                await func()
+
+        def run(number: int) -> float:
+            started = time.perf_counter()
+            loop.run_until_complete(batch(number))
+            return time.perf_counter() - started
+
+    else:
+        timer = timeit.Timer(func)
+        run = timer.timeit
+
+    number = 1
+    while run(number) < MIN_TIME:
+        number *= 2
+    best = min(run(number) for _ in range(REPEAT))
+    if is_async:
+        loop.close()
+    return best / number * 1e9
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Печатает сравнение с baseline и возвращает имена регрессировавших кейсов."""
+    regressions = []
+    print(f"{'кейс':<34}{'baseline, нс':>14}{'сейчас, нс':>14}{'изменение':>12}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<34}{'—':>14}{value:>14.0f}{'новый':>12}")
+            continue
+        change = value / base - 1
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  РЕГРЕССИЯ"
+        print(f"{name:<34}{base:>14.0f}{value:>14.0f}{change:>+11.0%}{mark}")
+    return regressions
+
+
+def main() -> int:
+    """Запускает кейсы, сохраняет результаты и сравнивает с baseline."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-k", "--filter", default="", help="подстрока в имени кейса")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="файл результатов")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="файл baseline")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="записать результаты в baseline"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="допустимое замедление (0.25 = +25%%)"
+    )
+    args = parser.parse_args()
+
+    cases = {name: case for name, case in build_cases().items() if args.filter in name}
+    results = {}
+    for name, (func, is_async) in cases.items():
+        results[name] = round(measure(func, is_async), 1)
+
+    report = {
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results_ns": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", "utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", "utf-8")
+        print(f"baseline сохранён: {args.baseline}")
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text("utf-8"))["results_ns"]
+    regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f"\nРегрессии (> +{args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
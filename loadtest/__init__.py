@@ -0,0 +1 @@
+"""Нагрузочный стенд: заглушки Ubilling и Bot API, генератор обновлений."""
@@ -0,0 +1,235 @@
+"""
+Нагрузочный прогон бота целиком: реальный Dispatcher и роутеры из
+setup_routers(), заглушки Ubilling XMLAgent и Telegram Bot API.
+
+Нужны PostgreSQL (с применёнными миграциями) и Redis из .env/окружения:
+синтетические сессии создаются в таблице sessions и удаляются после
+прогона. Ubilling и Telegram не используются.
+
+Запуск из корня репозитория:
+    python -m loadtest --users 1000 --actions 20
+    python -m loadtest --billing-latency 0.3 --billing-error-rate 0.05
+    python -m loadtest --no-cache --output loadtest-nocache.json
+    python -m loadtest --outbound-limits   # с лимитами исходящих запросов к Bot API
+
+Отчёт: пропускная способность и p50/p95/p99 по обработчикам, вызовы
+Bot API по методам, запросы XMLAgent по типам.
+
+Лимиты исходящих запросов (OUTBOUND_*) по умолчанию сняты: иначе
+задержки измеряли бы ожидание токенов (1 запрос в секунду в чат), а не
+работу бота. --outbound-limits оставляет лимиты из окружения.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from loadtest.fake_telegram import FakeTelegram  # noqa: E402
+from loadtest.fake_ubilling import FakeUbilling  # noqa: E402
+from loadtest.generator import USER_ID_BASE, UpdateFactory, simulate_user  # noqa: E402
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль по отсортированному списку (ближайший ранг)."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add = parser.add_argument
+    add("--users", type=int, default=1000, help="синтетических пользователей")
+    add("--actions", type=int, default=20, help="действий на пользователя")
+    add("--think", type=float, default=1.0, help="средняя пауза между действиями, с")
+    add("--ramp", type=float, default=10.0, help="за сколько секунд подключаются все пользователи")
+    add("--billing-latency", type=float, default=0.05, help="средняя задержка XMLAgent, с")
+    add("--billing-error-rate", type=float, default=0.0, help="доля ответов XMLAgent 500")
+    add("--billing-timeout-rate", type=float, default=0.0, help="доля зависших запросов XMLAgent")
+    add("--telegram-latency", type=float, default=0.02, help="средняя задержка Bot API, с")
+    add("--no-cache", action="store_true", help="выключить кэш ответов Ubilling")
+    add(
+        "--outbound-limits",
+        action="store_true",
+        help="оставить лимиты исходящих запросов к Bot API из окружения",
+    )
+    add("--seed", type=int, default=None, help="зерно генератора случайных чисел")
+    add("--output", type=Path, default=None, help="записать отчёт в JSON")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Поднимает заглушки и бота, прогоняет пользователей и собирает отчёт."""
+    ubilling = FakeUbilling(
+        latency=args.billing_latency,
+        error_rate=args.billing_error_rate,
+        timeout_rate=args.billing_timeout_rate,
+        seed=args.seed,
+    )
+    telegram = FakeTelegram(latency=args.telegram_latency, seed=args.seed)
+    ubilling_url = await ubilling.start()
+    telegram_url = await telegram.start()
+
+    # Настройки читаются при импорте bot.config — окружение задаётся до импорта
+    os.environ["UBILLING_URL"] = ubilling_url
+    os.environ["TELEGRAM_API_URL"] = telegram_url
+    os.environ["BOT_TOKEN"] = "123456:LOADTEST"
+    os.environ["BOT_MODE"] = "polling"
+    os.environ["WATCHER_ENABLED"] = "false"
+    if args.no_cache:
+        os.environ["BILLING_CACHE_ENABLED"] = "false"
+    if not args.outbound_limits:
+        os.environ["OUTBOUND_GLOBAL_RATE"] = "1000000"
+        os.environ["OUTBOUND_CHAT_RATE"] = "1000000"
+        os.environ["OUTBOUND_CHAT_BURST"] = "1000000"
+
+    from sqlalchemy import delete
+
+    from bot.app import bot_app
+    from bot.db import Session, async_session, session_cache
+    from bot.startup import setup_logging
+
+    setup_logging()
+
+    synthetic = Session.telegram_id.between(USER_ID_BASE, USER_ID_BASE + args.users)
+    handler_names: dict[int, str] = {}
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    async def record_handler(handler: Any, event: Any, data: dict[str, Any]) -> Any:
+        callback = data["handler"].callback
+        name = f"{callback.__module__.rpartition('.')[2]}.{callback.__name__}"
+        handler_names[data["event_update"].update_id] = name
+        return await handler(event, data)
+
+    async with bot_app(background_tasks=False) as (bot, dp):
+        dp.message.middleware(record_handler)
+        dp.callback_query.middleware(record_handler)
+
+        async with async_session() as db:
+            await db.execute(delete(Session).where(synthetic))
+            db.add_all(
+                Session(
+                    telegram_id=USER_ID_BASE + i,
+                    login=f"loadtest{i}",
+                    password_md5="0" * 32,
+                    locale="uk",
+                )
+                for i in range(args.users)
+            )
+            await db.commit()
+
+        async def feed(update: Any) -> None:
+            started = time.perf_counter()
+            failed = False
+            try:
+                await dp.feed_update(bot, update)
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - started
+            name = handler_names.pop(update.update_id, "unhandled")
+            latencies[name].append(elapsed)
+            if failed:
+                errors[name] += 1
+
+        rng = random.Random(args.seed)
+        factory = UpdateFactory()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    simulate_user(
+                        i,
+                        args.actions,
+                        args.think,
+                        args.ramp * i / max(1, args.users),
+                        factory,
+                        feed,
+                        random.Random(rng.random()),
+                    )
+                    for i in range(args.users)
+                )
+            )
+        finally:
+            wall = time.perf_counter() - started
+            async with async_session() as db:
+                await db.execute(delete(Session).where(synthetic))
+                await db.commit()
+            session_cache.clear()
+            coalesced = dp["billing"].coalesced_calls
+
+    await telegram.stop()
+    await ubilling.stop()
+
+    total = sum(len(values) for values in latencies.values())
+    handlers = {}
+    for name, values in sorted(latencies.items()):
+        values.sort()
+        handlers[name] = {
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+
+    return {
+        "config": {key: str(value) for key, value in vars(args).items()},
+        "updates": total,
+        "wall_seconds": round(wall, 2),
+        "throughput_per_second": round(total / wall, 1) if wall else 0.0,
+        "handlers": handlers,
+        "telegram_calls": dict(telegram.calls),
+        "ubilling_requests": dict(ubilling.requests),
+        "ubilling_injected_errors": dict(ubilling.errors),
+        "billing_coalesced_calls": coalesced,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Печатает отчёт таблицей."""
+    print(
+        f"\nОбновлений: {report['updates']} за {report['wall_seconds']} с "
+        f"— {report['throughput_per_second']} в секунду"
+    )
+    limits = "включены" if report["config"]["outbound_limits"] == "True" else "сняты"
+    print(f"Лимиты исходящих запросов к Bot API: {limits}")
+    print(
+        f"\n{'обработчик':<44}{'кол-во':>8}{'ошибок':>8}"
+        f"{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}"
+    )
+    for name, row in report["handlers"].items():
+        print(
+            f"{name:<44}{row['count']:>8}{row['errors']:>8}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+    print(f"\nBot API: {report['telegram_calls']}")
+    print(f"XMLAgent: {report['ubilling_requests']}")
+    if report["ubilling_injected_errors"]:
+        print(f"Внесённые ошибки XMLAgent: {report['ubilling_injected_errors']}")
+    print(f"Объединено одинаковых вызовов Ubilling: {report['billing_coalesced_calls']}")
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", "utf-8")
+
+
+if __name__ == "__main__":
+    main()
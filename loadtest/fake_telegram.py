@@ -0,0 +1,100 @@
+"""
+Заглушка Telegram Bot API на aiohttp.
+
+Отвечает на /bot<token>/<method> так, как это делает Bot API для
+методов, которые вызывают обработчики бота, и считает вызовы по методам.
+Бот направляется сюда через TELEGRAM_API_URL.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "LoadTestBot", "username": "loadtest_bot"}
+
+
+class FakeTelegram:
+    """Заглушка Bot API со статистикой вызовов."""
+
+    def __init__(self, latency: float = 0.02, seed: int | None = None) -> None:
+        """
+        Args:
+            latency: Средняя задержка ответа, секунд
+            seed: Зерно генератора случайных чисел
+        """
+        self._latency = latency
+        self._random = random.Random(seed)
+        self._message_ids = itertools.count(1_000_000)
+        self.calls: Counter[str] = Counter()
+        self._runner: web.AppRunner | None = None
+
+    async def _params(self, request: web.Request) -> dict[str, Any]:
+        """Параметры вызова: aiogram отправляет их как form-data."""
+        if request.content_type == "application/json":
+            return await request.json()
+        form = await request.post()
+        params: dict[str, Any] = {}
+        for key, value in form.items():
+            if isinstance(value, str) and value[:1] in "{[":
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            params[key] = value
+        return params
+
+    def _message(self, params: dict[str, Any], message_id: int | None = None) -> dict[str, Any]:
+        """Объект Message, который вернул бы Bot API."""
+        chat_id = int(params.get("chat_id", 0))
+        message: dict[str, Any] = {
+            "message_id": message_id or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+        if "reply_markup" in params:
+            message["reply_markup"] = params["reply_markup"]
+        return message
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Отвечает на вызов метода Bot API."""
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params = await self._params(request)
+        if self._latency > 0:
+            await asyncio.sleep(self._random.expovariate(1 / self._latency))
+
+        name = method.lower()
+        if name == "getme":
+            result: Any = BOT_USER
+        elif name == "sendmessage":
+            result = self._message(params)
+        elif name in ("editmessagetext", "editmessagereplymarkup"):
+            result = self._message(params, int(params.get("message_id", 0)) or None)
+        else:
+            # answerCallbackQuery, deleteMessage, deleteWebhook и т.п.
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Запускает сервер и возвращает его базовый URL для TELEGRAM_API_URL."""
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._runner is not None:
+            await self._runner.cleanup()
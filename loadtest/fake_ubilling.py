@@ -0,0 +1,170 @@
+"""
+Заглушка Ubilling XMLAgent (userstats) на aiohttp.
+
+Тип запроса определяется по первому параметру запроса, кроме служебных
+(xmlagent, json, uberlogin, uberpassword); без параметров — данные
+абонента. Ответ на запрос <тип> берётся из loadtest/fixtures/<тип>.json,
+если файл есть, иначе — из DEFAULTS. Для точной нагрузки стоит положить
+в fixtures реальные ответы своего Ubilling.
+
+Задержка ответа — экспоненциальная со средним latency, error_rate доля
+запросов получает 500, timeout_rate доля «зависает» на hang секунд.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SERVICE_PARAMS = {"xmlagent", "json", "uberlogin", "uberpassword", "module"}
+
+
+def _payments(count: int) -> dict[str, dict[str, Any]]:
+    """Синтетическая история платежей."""
+    now = time.time()
+    return {
+        str(i): {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now - i * 86400 * 7)),
+            "summ": f"{100 + i % 5 * 50}.00",
+            "balance": f"{1000 - i * 10}.00",
+            "paysys": "Cash",
+        }
+        for i in range(count)
+    }
+
+
+DEFAULTS: dict[str, Any] = {
+    "userdata": {
+        "address": "вул. Навантажувальна, 1",
+        "realname": "Load Test",
+        "login": "loadtest",
+        "cash": "250.00",
+        "ip": "10.0.0.2",
+        "phone": "",
+        "mobile": "0670000000",
+        "email": "",
+        "credit": "0",
+        "creditexpire": "No",
+        "payid": "100001",
+        "contract": "LT-1",
+        "tariff": "Home-100",
+        "tariffnm": "No",
+        "traffdownload": "10240",
+        "traffupload": "2048",
+        "trafftotal": "12288",
+        "accountstate": "Active",
+        "accountexpire": "2099-12-31",
+        "currency": "UAH",
+        "version": "loadtest",
+    },
+    "userauth": {"result": True},
+    "payments": _payments(60),
+    "feecharge": {},
+    "announcements": {},
+    "tickets": {},
+    "opayz": {},
+    "paymentsystems": {},
+    "vservices": {},
+    "tariffvservices": {},
+    "agentassigned": {"agentname": "Load Test ISP", "contact": "0800000000"},
+}
+
+
+class FakeUbilling:
+    """Заглушка XMLAgent со статистикой запросов по типам."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        hang: float = 30.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            latency: Средняя задержка ответа, секунд
+            error_rate: Доля ответов 500
+            timeout_rate: Доля запросов, которые не отвечают hang секунд
+            hang: Сколько «висит» запрос при имитации таймаута, секунд
+            seed: Зерно генератора случайных чисел
+        """
+        self._latency = latency
+        self._error_rate = error_rate
+        self._timeout_rate = timeout_rate
+        self._hang = hang
+        self._random = random.Random(seed)
+        self._fixtures = self._load_fixtures()
+        self._unknown: set[str] = set()
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self._runner: web.AppRunner | None = None
+
+    @staticmethod
+    def _load_fixtures() -> dict[str, Any]:
+        """Читает loadtest/fixtures/*.json поверх DEFAULTS."""
+        fixtures = dict(DEFAULTS)
+        for path in FIXTURES_DIR.glob("*.json"):
+            fixtures[path.stem] = json.loads(path.read_text("utf-8"))
+        return fixtures
+
+    def _kind(self, request: web.Request) -> str:
+        """Тип запроса XMLAgent."""
+        for name in request.query:
+            if name not in SERVICE_PARAMS:
+                return name
+        return "userdata"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Отвечает на любой запрос к XMLAgent."""
+        kind = self._kind(request)
+        self.requests[kind] += 1
+
+        roll = self._random.random()
+        if roll < self._timeout_rate:
+            self.errors[f"{kind}:timeout"] += 1
+            await asyncio.sleep(self._hang)
+        elif self._latency > 0:
+            await asyncio.sleep(self._random.expovariate(1 / self._latency))
+
+        if roll >= 1 - self._error_rate:
+            self.errors[f"{kind}:500"] += 1
+            return web.Response(status=500, text="injected error")
+
+        if kind not in self._fixtures:
+            if kind not in self._unknown:
+                self._unknown.add(kind)
+                logger.warning(
+                    "Неизвестный запрос XMLAgent %r: добавьте fixtures/%s.json", kind, kind
+                )
+            return web.json_response({})
+
+        body = self._fixtures[kind]
+        if kind == "userdata":
+            body = {**body, "login": request.query.get("uberlogin", body["login"])}
+        return web.json_response(body)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Запускает сервер и возвращает его базовый URL."""
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/billing/userstats"
+
+    async def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._runner is not None:
+            await self._runner.cleanup()
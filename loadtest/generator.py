@@ -0,0 +1,99 @@
+"""Синтетические пользователи: сценарий действий и построение Update."""
+
+import asyncio
+import itertools
+import random
+from datetime import UTC, datetime
+from typing import Awaitable, Callable
+
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from loadtest.fake_telegram import BOT_USER
+
+# telegram_id синтетических пользователей начинаются отсюда, чтобы не пересечься с реальными
+USER_ID_BASE = 7_000_000_000
+
+# (действие, вес): "/команда" — сообщение, остальное — callback_data.
+# Только чтение: сценарий не меняет состояние аккаунтов в Ubilling.
+SCENARIO: list[tuple[str, float]] = [
+    ("/menu", 8),
+    ("menu", 15),
+    ("info", 4),
+    ("info_account", 8),
+    ("info_provider", 2),
+    ("payments", 6),
+    ("payments_history", 10),
+    ("page:payments:2", 6),
+    ("fee_history", 3),
+    ("fee:current", 5),
+    ("payment_systems", 3),
+    ("tariffs", 3),
+    ("tariff_current", 5),
+    ("tariff_available", 2),
+    ("tickets", 2),
+    ("tickets_list", 4),
+    ("announcements", 4),
+    ("credit", 2),
+    ("freeze", 2),
+    ("alerts", 2),
+]
+
+
+class UpdateFactory:
+    """Строит Update от имени синтетического пользователя."""
+
+    def __init__(self) -> None:
+        self._update_ids = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+        self._bot = User(**BOT_USER)
+
+    def build(self, user_id: int, action: str) -> Update:
+        """Update для действия: /команда — сообщение, иначе нажатие кнопки."""
+        user = User(id=user_id, is_bot=False, first_name="Load", language_code="uk")
+        chat = Chat(id=user_id, type="private")
+        now = datetime.now(UTC)
+        update_id = next(self._update_ids)
+
+        if action.startswith("/"):
+            message = Message(
+                message_id=update_id, date=now, chat=chat, from_user=user, text=action
+            )
+            return Update(update_id=update_id, message=message)
+
+        message = Message(
+            message_id=update_id, date=now, chat=chat, from_user=self._bot, text="…"
+        )
+        callback = CallbackQuery(
+            id=str(next(self._callback_ids)),
+            from_user=user,
+            chat_instance=str(user_id),
+            message=message,
+            data=action,
+        )
+        return Update(update_id=update_id, callback_query=callback)
+
+
+async def simulate_user(
+    index: int,
+    actions: int,
+    think_time: float,
+    start_delay: float,
+    factory: UpdateFactory,
+    feed: Callable[[Update], Awaitable[None]],
+    rng: random.Random,
+) -> None:
+    """
+    Пользователь выполняет actions действий по сценарию с паузами.
+
+    Действия одного пользователя идут последовательно, как в реальном чате.
+    """
+    names = [name for name, _ in SCENARIO]
+    weights = [weight for _, weight in SCENARIO]
+    user_id = USER_ID_BASE + index
+
+    await asyncio.sleep(start_delay)
+    for _ in range(actions):
+        action = rng.choices(names, weights)[0]
+        await feed(factory.build(user_id, action))
+        if think_time > 0:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
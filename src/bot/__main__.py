@@ -2,83 +2,65 @@
 
 import asyncio
 import logging
-from pathlib import Path
+import sys
+from contextlib import nullcontext
 
-from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
-from aiogram.enums import ParseMode
-from aiogram.exceptions import TelegramBadRequest
-from aiogram.fsm.storage.redis import RedisStorage
-from aiogram.types import ErrorEvent
+from bot.startup import StartupError, setup_logging, timer
 
-from bot.config import settings
-from bot.db import engine
-from bot.handlers import setup_routers
-from bot.i18n import LocaleService
-from bot.middlewares import AuthMiddleware, LocaleMiddleware
-from bot.services import BillingService
+with timer.phase("настройки"):
+    from bot.config import settings
 
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper(), logging.INFO),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
-async def handle_message_not_modified(event: ErrorEvent) -> bool:
-    """
-    Глобальный обработчик ошибки 'message is not modified'.
-
-    Игнорирует эту ошибку, так как она безвредна — просто означает,
-    что содержимое сообщения не изменилось.
-    """
-    exc = event.exception
-    if isinstance(exc, TelegramBadRequest) and "message is not modified" in str(exc):
-        return True
-    return False
-
-
 async def main() -> None:
     """Главная функция запуска бота."""
-    bot = Bot(
-        token=settings.bot_token,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    if settings.bot_mode == "ingress":
+        from bot.app import create_bot
+        from bot.streams import run_ingress
+
+        bot = create_bot()
+        try:
+            logger.info("Ingress запущен")
+            await run_ingress(bot)
+        finally:
+            await bot.session.close()
+            logger.info("Ingress остановлен")
+        return
+
+    # Модули импортируются по режиму: ingress и супервизору воркеров
+    # не нужны обработчики, БД и сервисы
+    with timer.phase("импорт"):
+        from bot.app import bot_app
+        from bot.metrics import metrics_server
+        from bot.webhook import run_webhook
+
+    metrics = (
+        metrics_server(settings.metrics_host, settings.metrics_port)
+        if settings.metrics_enabled
+        else nullcontext()
     )
-    storage = RedisStorage.from_url(settings.redis_url)
-    dp = Dispatcher(storage=storage)
-
-    locales_dir = Path(__file__).parent.parent.parent / "locales"
-    locale_service = LocaleService(locales_dir, settings.default_locale)
-    locale_service.load()
-    logger.info("Загружены локали: %s", list(locale_service.available.keys()))
-
-    billing = BillingService(settings.ubilling_url, settings.ubilling_uber_key)
-    await billing.start()
-    logger.info("BillingService запущен")
-
-    dp["billing"] = billing
-    dp["locale_service"] = locale_service
-
-    dp.message.middleware(LocaleMiddleware(locale_service))
-    dp.callback_query.middleware(LocaleMiddleware(locale_service))
-    dp.message.middleware(AuthMiddleware())
-    dp.callback_query.middleware(AuthMiddleware())
-
-    router = setup_routers()
-    dp.include_router(router)
-
-    dp.errors.register(handle_message_not_modified, TelegramBadRequest)
-
-    try:
-        logger.info("Бот запущен")
-        await dp.start_polling(bot)
-    finally:
-        await billing.stop()
-        await bot.session.close()
-        await storage.close()
-        await engine.dispose()
-        logger.info("Бот остановлен")
+    async with bot_app() as (bot, dp), metrics:
+        try:
+            logger.info("Бот запущен в режиме %s", settings.bot_mode)
+            if settings.bot_mode == "webhook":
+                await run_webhook(dp, bot)
+            else:
+                await bot.delete_webhook()
+                await dp.start_polling(bot)
+        finally:
+            logger.info("Бот остановлен")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        if settings.bot_mode == "worker":
+            from bot.streams import run_worker_pool
+
+            run_worker_pool()
+        else:
+            asyncio.run(main())
+    except StartupError as e:
+        logger.error("%s", e)
+        sys.exit(1)
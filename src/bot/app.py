@@ -0,0 +1,290 @@
+"""Сборка бота: Bot, Dispatcher, сервисы и их корректное закрытие."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import ErrorEvent
+from httpx import Limits
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.config import settings
+from bot.db import engine, read_engine
+from bot.handlers import setup_routers
+from bot.i18n import LocaleService
+from bot.metrics import InstrumentedStorage, instrument_engine
+from bot.middlewares import (
+    AuthMiddleware,
+    HandlerMetricsMiddleware,
+    LocaleMiddleware,
+    MenuRefreshMiddleware,
+    OutboundScheduler,
+    PrefetchActivityMiddleware,
+    TimedMiddleware,
+    UpdateScheduler,
+)
+from bot.services import (
+    AccountSnapshotCache,
+    BillingService,
+    CircuitBreaker,
+    FeeChargeCache,
+    PaymentHistoryCache,
+    Prefetcher,
+    ResponseCache,
+)
+from bot.services.cache import DEFAULT_TTLS, SHARED_SCOPES
+from bot.services.sweeper import SessionSweeper
+from bot.services.watcher import AccountWatcher
+from bot.startup import check_ready, timer
+
+logger = logging.getLogger(__name__)
+
+
+def create_bot() -> Bot:
+    """Создаёт экземпляр Bot с HTML-разметкой и планировщиком исходящих запросов."""
+    session = None
+    if settings.telegram_api_url:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.telegram_api_url))
+    bot = Bot(
+        token=settings.bot_token,
+        session=session,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    bot.session.middleware(
+        OutboundScheduler(
+            global_rate=settings.outbound_global_rate,
+            chat_rate=settings.outbound_chat_rate,
+            chat_burst=settings.outbound_chat_burst,
+            bulk_reserve=settings.outbound_bulk_reserve,
+            max_retries=settings.outbound_max_retries,
+        )
+    )
+    return bot
+
+
+async def handle_message_not_modified(event: ErrorEvent) -> bool:
+    """
+    Глобальный обработчик ошибки 'message is not modified'.
+
+    Игнорирует эту ошибку, так как она безвредна — просто означает,
+    что содержимое сообщения не изменилось.
+    """
+    exc = event.exception
+    if isinstance(exc, TelegramBadRequest) and "message is not modified" in str(exc):
+        return True
+    return False
+
+
+async def _ping_database(db_engine: AsyncEngine) -> None:
+    """Открывает соединение пула и проверяет, что PostgreSQL отвечает."""
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _start_billing(billing: BillingService) -> None:
+    """Запускает BillingService и проверяет, что Ubilling отвечает."""
+    await billing.start()
+    await billing.ping()
+
+
+async def _close(bot: Bot, storage: RedisStorage, billing: BillingService) -> None:
+    """Закрывает соединения с Ubilling, Telegram, Redis и PostgreSQL."""
+    await billing.stop()
+    await bot.session.close()
+    await storage.close()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+@asynccontextmanager
+async def bot_app(background_tasks: bool = True) -> AsyncIterator[tuple[Bot, Dispatcher]]:
+    """
+    Собирает Bot и Dispatcher со всеми сервисами, middleware и роутерами.
+
+    Подключения к Redis, PostgreSQL и Ubilling открываются одновременно,
+    пока собирается Dispatcher. Если какой-то сервис не ответил за
+    STARTUP_TIMEOUT, соединения закрываются и выбрасывается StartupError.
+    Длительности фаз запуска пишутся в лог одной строкой.
+
+    При выходе из контекста останавливает фоновые задачи и закрывает
+    соединения с Ubilling, Telegram, Redis и PostgreSQL.
+
+    Args:
+        background_tasks: Запускать ли фоновые задачи (проверку аккаунтов
+            и очистку истёкших сессий).
+            Среди нескольких процессов их должен запускать только один.
+
+    Raises:
+        StartupError: Redis, PostgreSQL или Ubilling не готовы
+    """
+    build_started = time.perf_counter()
+    bot = create_bot()
+    storage = RedisStorage.from_url(settings.redis_url)
+    if settings.metrics_enabled:
+        instrument_engine(engine)
+        instrument_engine(read_engine)
+        fsm_storage = InstrumentedStorage(storage)
+    else:
+        fsm_storage = storage
+
+    scheduled = settings.update_concurrency > 0
+    dp = Dispatcher(storage=fsm_storage, disable_fsm=scheduled)
+    if scheduled:
+        # Планировщик должен стоять перед FSMContextMiddleware: состояние
+        # читается уже под замком пользователя. Dispatcher регистрирует FSM
+        # в __init__, поэтому он создаётся с disable_fsm и FSM добавляется после.
+        scheduler = UpdateScheduler(
+            settings.update_concurrency,
+            max_queued=settings.update_queue_limit,
+            max_user_queued=settings.update_user_queue_limit,
+        )
+        dp.update.outer_middleware(scheduler)
+        dp.update.outer_middleware(dp.fsm)
+        dp["update_scheduler"] = scheduler
+
+    locales_dir = Path(__file__).parent.parent.parent / "locales"
+    locale_service = LocaleService(locales_dir, settings.default_locale)
+    locale_service.load()
+    logger.info("Загружены локали: %s", list(locale_service.available.keys()))
+
+    cache = None
+    if settings.billing_cache_enabled:
+        cache = ResponseCache(
+            storage.redis,
+            {**DEFAULT_TTLS, **settings.billing_cache_ttl},
+            local_size=settings.billing_cache_local_size,
+            local_ttl=settings.billing_cache_local_ttl,
+            shared={**SHARED_SCOPES, **settings.billing_cache_shared},
+        )
+
+    breaker = None
+    if settings.billing_breaker_threshold > 0:
+        breaker = CircuitBreaker(
+            "Ubilling",
+            threshold=settings.billing_breaker_threshold,
+            reset_timeout=settings.billing_breaker_reset,
+            probes=settings.billing_breaker_probes,
+        )
+
+    billing = BillingService(
+        settings.ubilling_url,
+        settings.ubilling_uber_key,
+        cache=cache,
+        timeout=settings.billing_timeout,
+        timeouts=settings.billing_timeouts,
+        breaker=breaker,
+        limits=Limits(
+            max_connections=settings.ubilling_max_connections,
+            max_keepalive_connections=settings.ubilling_max_keepalive,
+            keepalive_expiry=settings.ubilling_keepalive_expiry,
+        ),
+        http2=settings.ubilling_http2,
+        warmup_connections=settings.ubilling_warmup_connections,
+    )
+    checks = {
+        "Redis": storage.redis.ping(),
+        "PostgreSQL": _ping_database(engine),
+        "Ubilling": _start_billing(billing),
+    }
+    if read_engine is not engine:
+        checks["PostgreSQL (реплика)"] = _ping_database(read_engine)
+    ready = asyncio.create_task(check_ready(checks, settings.startup_timeout))
+    # Если сборка Dispatcher упадёт, проверки не должны остаться висеть в фоне
+    try:
+        # Даём проверкам начать подключение, прежде чем собирать Dispatcher
+        await asyncio.sleep(0)
+
+        dp["billing"] = billing
+        dp["locale_service"] = locale_service
+        dp["payment_history"] = PaymentHistoryCache(storage.redis, settings.payments_history_ttl)
+        dp["fee_history"] = FeeChargeCache(
+            storage.redis, settings.fee_history_ttl, settings.fee_history_closed_ttl
+        )
+        snapshots = None
+        if settings.menu_snapshot_enabled:
+            snapshots = AccountSnapshotCache(storage.redis, settings.menu_snapshot_ttl)
+            dp["account_snapshots"] = snapshots
+        prefetcher = None
+        if settings.prefetch_enabled:
+            prefetcher = Prefetcher(
+                billing,
+                settings.prefetch_methods,
+                concurrency=settings.prefetch_concurrency,
+                idle_timeout=settings.prefetch_idle_timeout,
+            )
+            dp["prefetcher"] = prefetcher
+
+        for observer in (dp.message, dp.callback_query):
+            if snapshots is not None:
+                observer.outer_middleware(MenuRefreshMiddleware(snapshots))
+            if prefetcher is not None:
+                observer.outer_middleware(PrefetchActivityMiddleware(prefetcher))
+            locale_middleware = LocaleMiddleware(locale_service)
+            auth_middleware = AuthMiddleware()
+            if settings.metrics_enabled:
+                observer.middleware(TimedMiddleware(locale_middleware))
+                observer.middleware(TimedMiddleware(auth_middleware))
+                observer.middleware(HandlerMetricsMiddleware())
+            else:
+                observer.middleware(locale_middleware)
+                observer.middleware(auth_middleware)
+
+        router = setup_routers()
+        dp.include_router(router)
+
+        dp.errors.register(handle_message_not_modified, TelegramBadRequest)
+        timer.add("сборка", time.perf_counter() - build_started)
+
+        await ready
+    except BaseException:
+        ready.cancel()
+        await asyncio.gather(ready, return_exceptions=True)
+        await _close(bot, storage, billing)
+        raise
+    logger.info("Redis, PostgreSQL и Ubilling готовы")
+
+    tasks: list[asyncio.Task] = []
+    if background_tasks and settings.session_ttl_hours > 0:
+        sweeper = SessionSweeper(
+            settings.session_ttl_hours,
+            interval=settings.session_sweep_interval,
+            batch_size=settings.session_sweep_batch_size,
+        )
+        tasks.append(asyncio.create_task(sweeper.run()))
+        logger.info("Очистка истёкших сессий запущена")
+
+    if background_tasks and settings.watcher_enabled:
+        watcher = AccountWatcher(
+            bot,
+            billing,
+            locale_service,
+            storage.redis,
+            interval=settings.watcher_interval,
+            chunk_size=settings.watcher_chunk_size,
+            concurrency=settings.watcher_concurrency,
+            rate=settings.watcher_rate,
+            cooldown=settings.watcher_alert_cooldown,
+        )
+        tasks.append(asyncio.create_task(watcher.run()))
+        logger.info("Фоновая проверка аккаунтов запущена")
+
+    timer.log()
+    try:
+        yield bot, dp
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _close(bot, storage, billing)
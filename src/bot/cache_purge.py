@@ -0,0 +1,44 @@
+"""
+Сброс общего кэша справочных ответов Ubilling.
+
+Нужен после изменения тарифов, платёжных систем или данных контрагентов
+в Ubilling, чтобы абоненты не видели старые данные до истечения TTL.
+
+Запуск:
+    python -m bot.cache_purge                     # все справочные методы
+    python -m bot.cache_purge get_agent_data      # только указанные
+"""
+
+import argparse
+import asyncio
+
+from redis.asyncio import Redis
+
+from bot.config import settings
+from bot.services.cache import SHARED_SCOPES, ResponseCache
+
+
+async def purge(methods: tuple[str, ...]) -> int:
+    """Удаляет общие ответы методов из Redis и возвращает число удалённых ключей."""
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        cache = ResponseCache(redis, {}, shared={**SHARED_SCOPES, **settings.billing_cache_shared})
+        return await cache.purge(methods)
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("methods", nargs="*", help="методы UbillingClient (по умолчанию все)")
+    args = parser.parse_args()
+
+    methods = tuple(args.methods or SHARED_SCOPES)
+    deleted = asyncio.run(purge(methods))
+    print(f"Удалено ключей: {deleted} ({', '.join(methods)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """Конфигурация приложения через pydantic-settings."""
 
-from pydantic import field_validator
+from typing import Literal
+
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,15 +12,101 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     bot_token: str
+    telegram_api_url: str | None = None
     database_url: str
+    database_replica_url: str | None = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_recycle: int = -1
+    database_pool_pre_ping: bool = False
+    database_statement_cache_size: int = 100
+    database_replica_read_delay: float = 5.0
     redis_url: str = "redis://localhost:6379/0"
     ubilling_url: str
     ubilling_uber_key: str | None = None
     session_ttl_hours: int = 24
+    session_sweep_interval: float = 600.0
+    session_sweep_batch_size: int = 1000
     default_locale: str = "uk"
     log_level: str = "INFO"
 
-    @field_validator("ubilling_uber_key", mode="before")
+    bot_mode: Literal["polling", "webhook", "ingress", "worker"] = "polling"
+    webhook_base_url: str | None = None
+    webhook_path: str = "/webhook"
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+    webhook_secret: str | None = None
+
+    metrics_enabled: bool = True
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9100
+
+    stream_shards: int = 16
+    stream_workers: int = 2
+    stream_maxlen: int = 100000
+    stream_batch_size: int = 10
+    stream_claim_idle_ms: int = 60000
+    stream_concurrency: int = 100
+
+    session_cache_size: int = 10000
+    session_cache_ttl: float = 60.0
+    locale_cache_ttl: float = 3600.0
+
+    billing_cache_enabled: bool = True
+    billing_cache_ttl: dict[str, float] = {}
+    billing_cache_local_size: int = 1024
+    billing_cache_local_ttl: float = 5.0
+    billing_cache_shared: dict[str, Literal["global", "tariff", "content", "login"]] = {}
+
+    ubilling_max_connections: int = 100
+    ubilling_max_keepalive: int = 20
+    ubilling_keepalive_expiry: float = 5.0
+    ubilling_http2: bool = False
+    ubilling_warmup_connections: int = 4
+
+    billing_timeout: float = 10.0
+    billing_timeouts: dict[str, float] = {}
+    billing_breaker_threshold: int = 5
+    billing_breaker_reset: float = 30.0
+    billing_breaker_probes: int = 1
+
+    payments_history_ttl: int = 300
+    fee_history_ttl: int = 300
+    fee_history_closed_ttl: int = 2592000
+    menu_snapshot_enabled: bool = False
+    menu_snapshot_ttl: int = 86400
+
+    update_concurrency: int = 100
+    update_queue_limit: int = 1000
+    update_user_queue_limit: int = 10
+    startup_timeout: float = 15.0
+
+    prefetch_enabled: bool = False
+    prefetch_methods: list[str] = ["get_payments", "get_user_info", "get_tariff_vservices"]
+    prefetch_concurrency: int = 4
+    prefetch_idle_timeout: float = 20.0
+
+    outbound_global_rate: float = 30.0
+    outbound_chat_rate: float = 1.0
+    outbound_chat_burst: float = 3.0
+    outbound_bulk_reserve: float = 0.2
+    outbound_max_retries: int = 3
+
+    watcher_enabled: bool = False
+    watcher_interval: float = 3600.0
+    watcher_chunk_size: int = 500
+    watcher_concurrency: int = 8
+    watcher_rate: float = 5.0
+    watcher_alert_cooldown: int = 86400
+
+    @field_validator(
+        "ubilling_uber_key",
+        "webhook_base_url",
+        "webhook_secret",
+        "database_replica_url",
+        "telegram_api_url",
+        mode="before",
+    )
     @classmethod
     def empty_str_to_none(cls, v: str | None) -> str | None:
         """Преобразует пустую строку в None."""
@@ -26,5 +114,39 @@ class Settings(BaseSettings):
             return None
         return v
 
+    @model_validator(mode="after")
+    def check_webhook(self) -> "Settings":
+        """Проверяет, что для режимов webhook и ingress заданы URL и секрет."""
+        if self.bot_mode in ("webhook", "ingress") and not (
+            self.webhook_base_url and self.webhook_secret
+        ):
+            raise ValueError(
+                f"Для BOT_MODE={self.bot_mode} нужны WEBHOOK_BASE_URL и WEBHOOK_SECRET"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_streams(self) -> "Settings":
+        """Проверяет, что каждому воркеру достаётся хотя бы один шард."""
+        if not 1 <= self.stream_workers <= self.stream_shards:
+            raise ValueError(
+                "STREAM_WORKERS должно быть от 1 до STREAM_SHARDS "
+                f"(сейчас {self.stream_workers} и {self.stream_shards})"
+            )
+        if self.stream_concurrency < 1:
+            raise ValueError("STREAM_CONCURRENCY должно быть не меньше 1")
+        return self
+
+    @model_validator(mode="after")
+    def check_outbound(self) -> "Settings":
+        """Проверяет лимиты исходящих запросов к Bot API."""
+        if self.outbound_global_rate <= 0 or self.outbound_chat_rate <= 0:
+            raise ValueError("OUTBOUND_GLOBAL_RATE и OUTBOUND_CHAT_RATE должны быть больше 0")
+        if self.outbound_chat_burst < 1:
+            raise ValueError("OUTBOUND_CHAT_BURST должно быть не меньше 1")
+        if not 0 <= self.outbound_bulk_reserve < 1:
+            raise ValueError("OUTBOUND_BULK_RESERVE должно быть в диапазоне [0, 1)")
+        return self
+
 
 settings = Settings()
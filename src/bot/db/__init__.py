@@ -1,6 +1,16 @@
 """Модуль базы данных."""
 
-from bot.db.engine import async_session, engine
+from bot.db.engine import async_read_session, async_session, engine, read_engine
 from bot.db.models import Base, Session
+from bot.db.session_cache import get_session, session_cache
 
-__all__ = ["Base", "Session", "async_session", "engine"]
+__all__ = [
+    "Base",
+    "Session",
+    "async_read_session",
+    "async_session",
+    "engine",
+    "get_session",
+    "read_engine",
+    "session_cache",
+]
@@ -1,9 +1,39 @@
 """Создание async engine и sessionmaker для PostgreSQL."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from bot.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Создаёт engine с настройками пула из Settings."""
+    connect_args = {}
+    if make_url(url).drivername.endswith("+asyncpg"):
+        connect_args["statement_cache_size"] = settings.database_statement_cache_size
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+engine = _create_engine(settings.database_url)
+
+# Реплика только для чтения; без DATABASE_REPLICA_URL чтение идёт в основную БД
+read_engine = (
+    _create_engine(settings.database_replica_url) if settings.database_replica_url else engine
+)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
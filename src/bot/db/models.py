@@ -2,7 +2,7 @@
 
 from datetime import UTC, datetime
 
-from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -22,5 +22,8 @@ class Session(Base):
     password_md5: Mapped[str] = mapped_column(String(32), nullable=False)
     locale: Mapped[str] = mapped_column(String(5), nullable=False, default="uk")
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True
     )
+    # Пороги уведомлений: None — уведомление выключено
+    alert_balance: Mapped[float | None] = mapped_column(Float, nullable=True)
+    alert_expire_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -0,0 +1,151 @@
+"""In-process LRU+TTL кэш сессий авторизации."""
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from bot.config import settings
+from bot.db.engine import async_read_session, async_session
+from bot.db.models import Session
+
+MISSING = object()
+
+
+class SessionCache:
+    """
+    Кэш строк таблицы sessions по telegram_id.
+
+    Хранит и отсутствие сессии (None), чтобы неавторизованные пользователи
+    тоже не порождали запрос к БД на каждое событие. Все записи в sessions
+    должны явно вызывать invalidate().
+
+    Отдельно и дольше хранится локаль пользователя: её достаточно
+    обработчикам, которым сама сессия не нужна.
+
+    После invalidate() сессия пользователя какое-то время читается из
+    основной БД, а не из реплики, чтобы отставание реплики не вернуло
+    только что изменённую строку в старом виде. Отметка о записи хранится
+    в памяти процесса: она защищает только чтения в том же процессе, что
+    верно для polling и шардированных воркеров, но не для нескольких
+    webhook-реплик.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 60.0,
+        locale_ttl: float = 3600.0,
+        primary_read_delay: float = 5.0,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            max_size: Максимальное количество записей
+            ttl: Время жизни записи в секундах
+            locale_ttl: Время жизни запомненной локали в секундах
+            primary_read_delay: Сколько секунд после записи читать сессию из основной БД
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._locale_ttl = locale_ttl
+        self._primary_read_delay = primary_read_delay
+        self._entries: OrderedDict[int, tuple[float, Session | None]] = OrderedDict()
+        self._locales: OrderedDict[int, tuple[float, str]] = OrderedDict()
+        self._written: dict[int, float] = {}
+
+    def get(self, telegram_id: int) -> Session | None | object:
+        """Возвращает закэшированную сессию, None или MISSING."""
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            return MISSING
+        expires_at, session = entry
+        if expires_at <= time.monotonic():
+            del self._entries[telegram_id]
+            return MISSING
+        self._entries.move_to_end(telegram_id)
+        return session
+
+    def set(self, telegram_id: int, session: Session | None) -> None:
+        """Сохраняет сессию (или её отсутствие) в кэш."""
+        if session is not None:
+            self.set_locale(telegram_id, session.locale)
+        if self._ttl <= 0:
+            return
+        self._entries[telegram_id] = (time.monotonic() + self._ttl, session)
+        self._entries.move_to_end(telegram_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get_locale(self, telegram_id: int) -> str | None:
+        """Возвращает запомненную локаль пользователя или None."""
+        entry = self._locales.get(telegram_id)
+        if entry is None:
+            return None
+        expires_at, locale = entry
+        if expires_at <= time.monotonic():
+            del self._locales[telegram_id]
+            return None
+        self._locales.move_to_end(telegram_id)
+        return locale
+
+    def set_locale(self, telegram_id: int, locale: str) -> None:
+        """Запоминает локаль пользователя."""
+        if self._locale_ttl <= 0:
+            return
+        self._locales[telegram_id] = (time.monotonic() + self._locale_ttl, locale)
+        self._locales.move_to_end(telegram_id)
+        while len(self._locales) > self._max_size:
+            self._locales.popitem(last=False)
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Удаляет запись пользователя из кэша и временно направляет чтение в основную БД."""
+        self._entries.pop(telegram_id, None)
+        if self._primary_read_delay > 0:
+            now = time.monotonic()
+            if len(self._written) >= self._max_size:
+                self._written = {k: v for k, v in self._written.items() if v > now}
+            self._written[telegram_id] = now + self._primary_read_delay
+
+    def read_from_primary(self, telegram_id: int) -> bool:
+        """Нужно ли читать сессию из основной БД (недавно была запись)."""
+        until = self._written.get(telegram_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._written[telegram_id]
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Полностью очищает кэш."""
+        self._entries.clear()
+        self._locales.clear()
+        self._written.clear()
+
+
+session_cache = SessionCache(
+    settings.session_cache_size,
+    settings.session_cache_ttl,
+    settings.locale_cache_ttl,
+    settings.database_replica_read_delay if settings.database_replica_url else 0.0,
+)
+
+
+async def get_session(telegram_id: int) -> Session | None:
+    """Возвращает сессию пользователя из кэша, реплики или основной БД."""
+    cached = session_cache.get(telegram_id)
+    if cached is not MISSING:
+        return cached
+
+    if session_cache.read_from_primary(telegram_id):
+        sessionmaker = async_session
+    else:
+        sessionmaker = async_read_session
+    async with sessionmaker() as db:
+        result = await db.execute(select(Session).where(Session.telegram_id == telegram_id))
+        session = result.scalar_one_or_none()
+
+    session_cache.set(telegram_id, session)
+    return session
@@ -2,22 +2,29 @@
 
 from aiogram import Router
 
-from bot.handlers import (
-    announcements,
-    credit,
-    freeze,
-    info,
-    language,
-    menu,
-    payments,
-    start,
-    tariffs,
-    tickets,
-)
-
 
 def setup_routers() -> Router:
-    """Создаёт и настраивает главный роутер с подроутерами."""
+    """
+    Создаёт и настраивает главный роутер с подроутерами.
+
+    Модули обработчиков импортируются здесь, а не при импорте пакета:
+    процессам, которым обработчики не нужны (ingress, супервизор
+    воркеров), не приходится их загружать.
+    """
+    from bot.handlers import (
+        alerts,
+        announcements,
+        credit,
+        freeze,
+        info,
+        language,
+        menu,
+        payments,
+        start,
+        tariffs,
+        tickets,
+    )
+
     router = Router()
     router.include_router(start.router)
     router.include_router(menu.router)
@@ -29,4 +36,5 @@ def setup_routers() -> Router:
     router.include_router(credit.router)
     router.include_router(info.router)
     router.include_router(language.router)
+    router.include_router(alerts.router)
     return router
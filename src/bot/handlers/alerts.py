@@ -0,0 +1,79 @@
+"""Обработчики настройки уведомлений о балансе и окончании услуги."""
+
+from typing import Callable
+
+from aiogram import F, Router
+from aiogram.types import CallbackQuery
+from sqlalchemy import update
+
+from bot.db import Session, async_session, session_cache
+from bot.keyboards import alerts_keyboard
+from bot.keyboards.alerts import BALANCE_PRESETS, EXPIRE_PRESETS
+
+router = Router()
+
+
+def _alerts_text(t: Callable[..., str], balance: float | None, expire_days: int | None) -> str:
+    """Текст с текущими настройками уведомлений."""
+    lines = [t("alerts.title"), "", t("alerts.description"), ""]
+    if balance is None:
+        lines.append(t("alerts.balance_off"))
+    else:
+        lines.append(t("alerts.balance_on", threshold=f"{balance:g}"))
+    if expire_days is None:
+        lines.append(t("alerts.expire_off"))
+    else:
+        lines.append(t("alerts.expire_on", days=expire_days))
+    return "\n".join(lines)
+
+
+@router.callback_query(F.data == "alerts")
+async def show_alerts(
+    callback: CallbackQuery, t: Callable[..., str], session: Session, **kwargs
+) -> None:
+    """Показывает текущие настройки уведомлений."""
+    await callback.message.edit_text(
+        _alerts_text(t, session.alert_balance, session.alert_expire_days),
+        reply_markup=alerts_keyboard(t, session.alert_balance, session.alert_expire_days),
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("alert_balance:") | F.data.startswith("alert_expire:"))
+async def set_alert_threshold(
+    callback: CallbackQuery, t: Callable[..., str], session: Session, **kwargs
+) -> None:
+    """
+    Сохраняет выбранный порог уведомления.
+
+    Принимаются только значения с клавиатуры (пресеты или "off"):
+    callback_data приходит от клиента и может быть любой строкой.
+    """
+    kind, raw_value = callback.data.split(":", 1)
+    presets = BALANCE_PRESETS if kind == "alert_balance" else EXPIRE_PRESETS
+    choices = {str(value): value for value in presets}
+    if raw_value != "off" and raw_value not in choices:
+        await callback.answer(t("alerts.invalid"), show_alert=True)
+        return
+    value = None if raw_value == "off" else choices[raw_value]
+
+    balance = session.alert_balance
+    expire_days = session.alert_expire_days
+    if kind == "alert_balance":
+        balance = None if value is None else float(value)
+        values = {"alert_balance": balance}
+    else:
+        expire_days = value
+        values = {"alert_expire_days": expire_days}
+
+    user_id = callback.from_user.id
+    async with async_session() as db:
+        await db.execute(update(Session).where(Session.telegram_id == user_id).values(**values))
+        await db.commit()
+    session_cache.invalidate(user_id)
+
+    await callback.message.edit_text(
+        _alerts_text(t, balance, expire_days),
+        reply_markup=alerts_keyboard(t, balance, expire_days),
+    )
+    await callback.answer(t("alerts.saved"))
@@ -7,6 +7,7 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMar
 
 from bot.keyboards.common import back_button
 from bot.services import BillingService
+from bot.utils.formatting import format_error
 
 router = Router()
 
@@ -23,9 +24,9 @@ async def show_announcements(
     """Показывает список объявлений."""
     try:
         announcements = await billing.client.get_announcements(login, password_md5)
-    except Exception:
+    except Exception as e:
         kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "menu")]])
-        await callback.message.edit_text(t("errors.connection"), reply_markup=kb)
+        await callback.message.edit_text(format_error(t, e), reply_markup=kb)
         await callback.answer()
         return
 
@@ -64,8 +65,8 @@ async def mark_announcements_read(
     try:
         await billing.client.mark_announcements_read(login, password_md5)
         text = t("announcements.marked")
-    except Exception:
-        text = t("errors.connection")
+    except Exception as e:
+        text = format_error(t, e)
 
     kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "menu")]])
     await callback.message.edit_text(text, reply_markup=kb)
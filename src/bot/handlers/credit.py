@@ -6,7 +6,8 @@ from aiogram import F, Router
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 
 from bot.keyboards.common import back_button
-from bot.services import BillingService
+from bot.services import BillingService, PaymentHistoryCache
+from bot.utils.formatting import format_error
 
 router = Router()
 
@@ -23,9 +24,9 @@ async def show_credit_info(
     """Показывает информацию о кредите."""
     try:
         data = await billing.client.check_credit(login, password_md5)
-    except Exception:
+    except Exception as e:
         kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "menu")]])
-        await callback.message.edit_text(t("errors.connection"), reply_markup=kb)
+        await callback.message.edit_text(format_error(t, e), reply_markup=kb)
         await callback.answer()
         return
 
@@ -70,6 +71,7 @@ async def do_get_credit(
     callback: CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
+    payment_history: PaymentHistoryCache,
     login: str,
     password_md5: str,
     **kwargs,
@@ -78,8 +80,10 @@ async def do_get_credit(
     try:
         result = await billing.client.get_credit(login, password_md5)
         text = result.message or t("credit.success")
-    except Exception:
-        text = t("errors.connection")
+    except Exception as e:
+        text = format_error(t, e)
+    finally:
+        await payment_history.invalidate(callback.from_user.id, login)
 
     kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "menu")]])
     await callback.message.edit_text(text, reply_markup=kb)
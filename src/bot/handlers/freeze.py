@@ -8,6 +8,7 @@ from aiogram.types import CallbackQuery
 
 from bot.keyboards import freeze_confirm_keyboard, freeze_menu_keyboard
 from bot.services import BillingService
+from bot.utils.formatting import format_error
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +44,10 @@ async def show_freeze_status(
 
         kb = freeze_menu_keyboard(t, can_freeze=can_freeze, is_frozen=is_frozen)
         await callback.message.edit_text("\n".join(lines), reply_markup=kb)
-    except Exception:
+    except Exception as e:
         logger.exception("Ошибка при обработке данных заморозки")
         await callback.message.edit_text(
-            t("errors.connection"), reply_markup=freeze_menu_keyboard(t)
+            format_error(t, e), reply_markup=freeze_menu_keyboard(t)
         )
     await callback.answer()
 
@@ -83,9 +84,9 @@ async def do_freeze(
         result = await billing.client.freeze_user(login, password_md5)
         logger.debug("Результат заморозки: %r", result)
         text = result.message or t("freeze.frozen")
-    except Exception:
+    except Exception as e:
         logger.exception("Ошибка при заморозке аккаунта")
-        text = t("errors.connection")
+        text = format_error(t, e)
 
     await callback.message.edit_text(text, reply_markup=freeze_menu_keyboard(t))
     await callback.answer()
@@ -105,9 +106,9 @@ async def do_unfreeze(
         result = await billing.client.unfreeze_user(login, password_md5)
         logger.debug("Результат разморозки: %r", result)
         text = result.message or t("freeze.unfrozen")
-    except Exception:
+    except Exception as e:
         logger.exception("Ошибка при разморозке аккаунта")
-        text = t("errors.connection")
+        text = format_error(t, e)
 
     await callback.message.edit_text(text, reply_markup=freeze_menu_keyboard(t))
     await callback.answer()
@@ -10,7 +10,7 @@ from pydantic import ValidationError
 
 from bot.keyboards.common import back_button
 from bot.services import BillingService
-from bot.utils.formatting import format_full_user_info
+from bot.utils.formatting import format_error, format_full_user_info
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +46,9 @@ async def show_account_info(
             billing.client.get_user_info(login, password_md5),
             billing.client.get_tariff_vservices(login, password_md5),
         )
-    except Exception:
+    except Exception as e:
         kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "info")]])
-        await callback.message.edit_text(t("errors.connection"), reply_markup=kb)
+        await callback.message.edit_text(format_error(t, e), reply_markup=kb)
         await callback.answer()
         return
 
@@ -77,10 +77,10 @@ async def show_provider_info(
         await callback.message.edit_text(t("provider.not_assigned"), reply_markup=kb)
         await callback.answer()
         return
-    except Exception:
+    except Exception as e:
         logger.exception("Ошибка получения данных провайдера для login=%s", login)
         kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "info")]])
-        await callback.message.edit_text(t("errors.connection"), reply_markup=kb)
+        await callback.message.edit_text(format_error(t, e), reply_markup=kb)
         await callback.answer()
         return
 
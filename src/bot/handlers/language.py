@@ -7,11 +7,11 @@ from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy import update
 
-from bot.db import Session, async_session
+from bot.db import Session, async_session, session_cache
 from bot.handlers.menu import show_main_menu
 from bot.i18n import LocaleService
 from bot.keyboards import language_keyboard
-from bot.services import BillingService
+from bot.services import AccountSnapshotCache, BillingService
 
 router = Router()
 
@@ -41,6 +41,10 @@ async def show_language_menu(
 async def set_language(
     callback: CallbackQuery,
     locale_service: LocaleService,
+    billing: BillingService | None = None,
+    login: str | None = None,
+    password_md5: str | None = None,
+    account_snapshots: AccountSnapshotCache | None = None,
     **kwargs,
 ) -> None:
     """Устанавливает выбранный язык и возвращает в главное меню."""
@@ -52,16 +56,13 @@ async def set_language(
             update(Session).where(Session.telegram_id == user_id).values(locale=new_locale)
         )
         await db.commit()
+    session_cache.invalidate(user_id)
+    session_cache.set_locale(user_id, new_locale)
 
-    def t(key, **kw):
-        return locale_service.get(new_locale, key, **kw)
-
-    billing: BillingService = kwargs.get("billing")
-    login: str = kwargs.get("login")
-    password_md5: str = kwargs.get("password_md5")
+    t = locale_service.translator(new_locale)
 
     if billing and login and password_md5:
-        await show_main_menu(callback, t, billing, login, password_md5)
+        await show_main_menu(callback, t, billing, login, password_md5, account_snapshots)
     else:
         await callback.message.edit_text(t("language.changed"))
         await callback.answer()
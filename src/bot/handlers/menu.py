@@ -1,15 +1,20 @@
 """Обработчик главного меню."""
 
 import asyncio
-from typing import Callable
+import logging
+from types import SimpleNamespace
+from typing import Any, Callable
 
 from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 
 from bot.keyboards import main_menu_keyboard
-from bot.services import BillingService
-from bot.utils.formatting import format_user_info
+from bot.services import AccountSnapshotCache, BillingService, Prefetcher
+from bot.utils.formatting import format_age, format_error, format_user_info
+
+logger = logging.getLogger(__name__)
 
 router = Router()
 
@@ -22,31 +27,118 @@ def _extract_tariff_name(services: list) -> str | None:
     return None
 
 
+def _snapshot(user: Any, services: list) -> dict[str, Any]:
+    """Поля аккаунта, которые показывает главное меню."""
+    return {
+        "realname": user.realname,
+        "cash": str(user.cash),
+        "currency": user.currency,
+        "tariff_name": _extract_tariff_name(services) or user.tariff_name,
+        "account_state": user.account_state,
+    }
+
+
+def _snapshot_changed(old: dict[str, Any], new: dict[str, Any]) -> bool:
+    """Изменились ли баланс, тариф или статус."""
+    fields = ("cash", "tariff_name", "account_state")
+    return any(old.get(field) != new.get(field) for field in fields)
+
+
+async def _fetch_snapshot(billing: BillingService, login: str, password_md5: str) -> dict[str, Any]:
+    """Загружает данные для главного меню из Ubilling."""
+    user, services = await asyncio.gather(
+        billing.client.get_user_info(login, password_md5),
+        billing.client.get_tariff_vservices(login, password_md5),
+    )
+    return _snapshot(user, services)
+
+
 async def show_main_menu(
     event: Message | CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
     login: str,
     password_md5: str,
+    snapshots: AccountSnapshotCache | None = None,
+    prefetcher: Prefetcher | None = None,
 ) -> None:
-    """Отображает главное меню с информацией о пользователе."""
-    try:
-        user, services = await asyncio.gather(
-            billing.client.get_user_info(login, password_md5),
-            billing.client.get_tariff_vservices(login, password_md5),
+    """
+    Отображает главное меню с информацией о пользователе.
+
+    Если передан кэш снимков и в нём есть данные пользователя, меню
+    отрисовывается сразу из снимка с отметкой его давности, а свежие
+    данные загружаются в фоне. Prefetcher заранее загружает данные
+    экранов, которые обычно открывают следующими.
+    """
+    user_id = event.from_user.id
+    kb = main_menu_keyboard(t)
+    if prefetcher is not None:
+        prefetcher.schedule(user_id, login, password_md5)
+
+    cached = await snapshots.get(user_id, login) if snapshots is not None else None
+    if cached is not None:
+        snapshot, fetched_at = cached
+        text = "\n\n".join(
+            [format_user_info(t, SimpleNamespace(**snapshot)), format_age(t, fetched_at, "user_info.snapshot")]
         )
-        tariff_name = _extract_tariff_name(services)
-        text = format_user_info(t, user, tariff_name=tariff_name)
-    except Exception:
-        text = t("errors.connection")
+        message = await _show(event, text, kb)
+        snapshots.track(
+            user_id,
+            asyncio.create_task(
+                _revalidate(message, t, billing, snapshots, user_id, login, password_md5, snapshot)
+            ),
+        )
+        return
 
-    kb = main_menu_keyboard(t)
+    try:
+        snapshot = await _fetch_snapshot(billing, login, password_md5)
+        text = format_user_info(t, SimpleNamespace(**snapshot))
+    except Exception as e:
+        text = format_error(t, e)
+    else:
+        if snapshots is not None:
+            await snapshots.set(user_id, login, snapshot)
+
+    await _show(event, text, kb)
 
+
+async def _show(
+    event: Message | CallbackQuery, text: str, kb: InlineKeyboardMarkup
+) -> Message:
+    """Показывает меню и возвращает сообщение с ним."""
     if isinstance(event, CallbackQuery):
         await event.message.edit_text(text, reply_markup=kb)
         await event.answer()
-    else:
-        await event.answer(text, reply_markup=kb)
+        return event.message
+    return await event.answer(text, reply_markup=kb)
+
+
+async def _revalidate(
+    message: Message,
+    t: Callable[..., str],
+    billing: BillingService,
+    snapshots: AccountSnapshotCache,
+    user_id: int,
+    login: str,
+    password_md5: str,
+    shown: dict[str, Any],
+) -> None:
+    """Обновляет снимок и редактирует меню, если баланс, тариф или статус изменились."""
+    try:
+        snapshot = await _fetch_snapshot(billing, login, password_md5)
+    except Exception:
+        logger.debug("Главное меню: не удалось обновить снимок %s", user_id, exc_info=True)
+        return
+    await snapshots.set(user_id, login, snapshot)
+    if not _snapshot_changed(shown, snapshot):
+        return
+
+    try:
+        await message.edit_text(
+            format_user_info(t, SimpleNamespace(**snapshot)), reply_markup=main_menu_keyboard(t)
+        )
+    except TelegramBadRequest:
+        logger.debug("Главное меню: сообщение %s уже изменено", message.message_id, exc_info=True)
 
 
 @router.message(Command("menu"))
@@ -56,10 +148,14 @@ async def cmd_menu(
     billing: BillingService,
     login: str,
     password_md5: str,
+    account_snapshots: AccountSnapshotCache | None = None,
+    prefetcher: Prefetcher | None = None,
     **kwargs,
 ) -> None:
     """Команда /menu — возврат в главное меню."""
-    await show_main_menu(message, t, billing, login, password_md5)
+    await show_main_menu(
+        message, t, billing, login, password_md5, account_snapshots, prefetcher
+    )
 
 
 @router.callback_query(F.data == "menu")
@@ -69,10 +165,14 @@ async def callback_menu(
     billing: BillingService,
     login: str,
     password_md5: str,
+    account_snapshots: AccountSnapshotCache | None = None,
+    prefetcher: Prefetcher | None = None,
     **kwargs,
 ) -> None:
     """Возврат в главное меню по кнопке."""
-    await show_main_menu(callback, t, billing, login, password_md5)
+    await show_main_menu(
+        callback, t, billing, login, password_md5, account_snapshots, prefetcher
+    )
 
 
 @router.callback_query(F.data == "noop")
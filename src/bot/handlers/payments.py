@@ -1,11 +1,11 @@
 """Обработчики раздела платежей."""
 
 from datetime import date, timedelta
-from typing import Callable
+from typing import Any, Callable
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
 
 from bot.keyboards import (
     fee_period_keyboard,
@@ -13,9 +13,10 @@ from bot.keyboards import (
     payment_systems_keyboard,
     payments_menu_keyboard,
 )
-from bot.keyboards.common import back_button, pagination_keyboard
-from bot.services import BillingService
+from bot.keyboards.common import pagination_keyboard
+from bot.services import BillingService, FeeChargeCache, PaymentHistoryCache
 from bot.states import PayCardForm
+from bot.utils.formatting import format_age, format_error
 from bot.utils.pagination import paginate
 
 router = Router()
@@ -33,12 +34,30 @@ async def show_payments_history(
     callback: CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
+    payment_history: PaymentHistoryCache,
     login: str,
     password_md5: str,
     **kwargs,
 ) -> None:
     """Показывает историю платежей."""
-    await _show_payments_page(callback, t, billing, login, password_md5, 1)
+    await _show_payments_page(callback, t, billing, payment_history, login, password_md5, 1)
+
+
+@router.callback_query(F.data == "payments_refresh")
+async def refresh_payments_history(
+    callback: CallbackQuery,
+    t: Callable[..., str],
+    billing: BillingService,
+    payment_history: PaymentHistoryCache,
+    login: str,
+    password_md5: str,
+    **kwargs,
+) -> None:
+    """Заново загружает историю платежей из Ubilling."""
+    await billing.invalidate(login, "get_payments")
+    await _show_payments_page(
+        callback, t, billing, payment_history, login, password_md5, 1, refresh=True
+    )
 
 
 @router.callback_query(F.data.startswith("page:payments:"))
@@ -46,30 +65,56 @@ async def payments_pagination(
     callback: CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
+    payment_history: PaymentHistoryCache,
     login: str,
     password_md5: str,
     **kwargs,
 ) -> None:
     """Обработка пагинации платежей."""
     page = int(callback.data.split(":")[2])
-    await _show_payments_page(callback, t, billing, login, password_md5, page)
+    await _show_payments_page(callback, t, billing, payment_history, login, password_md5, page)
+
+
+async def _load_payments(
+    callback: CallbackQuery,
+    billing: BillingService,
+    payment_history: PaymentHistoryCache,
+    login: str,
+    password_md5: str,
+    refresh: bool,
+) -> tuple[list[dict[str, Any]], float]:
+    """Возвращает отсортированную историю платежей и время её загрузки."""
+    user_id = callback.from_user.id
+    if not refresh:
+        cached = await payment_history.get(user_id, login)
+        if cached is not None:
+            return cached
+
+    payments = await billing.client.get_payments(login, password_md5)
+    payments = sorted(payments, key=lambda p: p.date or "", reverse=True)
+    rows = [{"date": p.date, "summ": p.summ, "balance": p.balance} for p in payments]
+    fetched_at = await payment_history.set(user_id, login, rows)
+    return rows, fetched_at
 
 
 async def _show_payments_page(
     callback: CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
+    payment_history: PaymentHistoryCache,
     login: str,
     password_md5: str,
     page: int,
+    refresh: bool = False,
 ) -> None:
     """Отображает страницу истории платежей."""
     try:
-        payments = await billing.client.get_payments(login, password_md5)
-        payments = sorted(payments, key=lambda p: p.date or "", reverse=True)
-    except Exception:
+        payments, fetched_at = await _load_payments(
+            callback, billing, payment_history, login, password_md5, refresh
+        )
+    except Exception as e:
         await callback.message.edit_text(
-            t("errors.connection"),
+            format_error(t, e),
             reply_markup=payments_menu_keyboard(t),
         )
         await callback.answer()
@@ -86,9 +131,12 @@ async def _show_payments_page(
     page_items, total_pages = paginate(payments, page)
     lines = [t("payments.history_title"), ""]
     for p in page_items:
-        lines.append(t("payments.payment_line", date=p.date or "—", summ=p.summ, balance=p.balance or "—"))
+        lines.append(t("payments.payment_line", date=p["date"] or "—", summ=p["summ"], balance=p["balance"] or "—"))
+    lines.append("")
+    lines.append(format_age(t, fetched_at, "payments.updated"))
 
-    kb = pagination_keyboard(t, "payments", page, total_pages, "payments")
+    refresh_button = InlineKeyboardButton(text=t("payments.refresh"), callback_data="payments_refresh")
+    kb = pagination_keyboard(t, "payments", page, total_pages, "payments", [refresh_button])
     await callback.message.edit_text("\n".join(lines), reply_markup=kb)
     await callback.answer()
 
@@ -105,31 +153,69 @@ async def show_fee_history(
     callback: CallbackQuery,
     t: Callable[..., str],
     billing: BillingService,
+    fee_history: FeeChargeCache,
     login: str,
     password_md5: str,
     **kwargs,
 ) -> None:
     """Показывает историю списаний за выбранный период."""
     period = callback.data.split(":")[1]
-    today = date.today()
+    await _show_fee_page(callback, t, billing, fee_history, login, password_md5, period, 1)
+
 
+@router.callback_query(F.data.startswith("page:fee_"))
+async def fee_pagination(
+    callback: CallbackQuery,
+    t: Callable[..., str],
+    billing: BillingService,
+    fee_history: FeeChargeCache,
+    login: str,
+    password_md5: str,
+    **kwargs,
+) -> None:
+    """Обработка пагинации списаний."""
+    _, section, page = callback.data.split(":")
+    period = section.removeprefix("fee_")
+    await _show_fee_page(
+        callback, t, billing, fee_history, login, password_md5, period, int(page)
+    )
+
+
+def _fee_period(period: str, today: date) -> tuple[date, date]:
+    """Границы периода списаний: текущий месяц, прошлый месяц или 90 дней."""
     if period == "current":
-        date_from = today.replace(day=1)
-        date_to = today
-    elif period == "last":
-        first_day = today.replace(day=1)
-        date_to = first_day - timedelta(days=1)
-        date_from = date_to.replace(day=1)
-    else:
-        date_from = today - timedelta(days=90)
-        date_to = today
+        return today.replace(day=1), today
+    if period == "last":
+        date_to = today.replace(day=1) - timedelta(days=1)
+        return date_to.replace(day=1), date_to
+    return today - timedelta(days=90), today
 
-    try:
+
+async def _show_fee_page(
+    callback: CallbackQuery,
+    t: Callable[..., str],
+    billing: BillingService,
+    fee_history: FeeChargeCache,
+    login: str,
+    password_md5: str,
+    period: str,
+    page: int,
+) -> None:
+    """Отображает страницу списаний за период."""
+    date_from, date_to = _fee_period(period, date.today())
+
+    async def fetch(fetch_from: date, fetch_to: date) -> list[dict[str, Any]]:
         charges = await billing.client.get_fee_charges(
-            login, password_md5, date_from=date_from.isoformat(), date_to=date_to.isoformat()
+            login, password_md5, date_from=fetch_from.isoformat(), date_to=fetch_to.isoformat()
+        )
+        return [{"date": c.date, "fee": c.fee, "tariff": c.tariff} for c in charges]
+
+    try:
+        charges = await fee_history.load(
+            callback.from_user.id, login, date_from, date_to, fetch
         )
-    except Exception:
-        await callback.message.edit_text(t("errors.connection"), reply_markup=fee_period_keyboard(t))
+    except Exception as e:
+        await callback.message.edit_text(format_error(t, e), reply_markup=fee_period_keyboard(t))
         await callback.answer()
         return
 
@@ -138,12 +224,12 @@ async def show_fee_history(
         await callback.answer()
         return
 
+    page_items, total_pages = paginate(charges, page)
     lines = [t("payments.fee_title", date_from=date_from, date_to=date_to), ""]
-    for c in charges[:10]:
-        lines.append(t("payments.fee_line", date=c.date or "—", fee=c.fee, tariff=c.tariff or "—"))
+    for c in page_items:
+        lines.append(t("payments.fee_line", date=c["date"] or "—", fee=c["fee"], tariff=c["tariff"] or "—"))
 
-    from aiogram.types import InlineKeyboardMarkup
-    kb = InlineKeyboardMarkup(inline_keyboard=[[back_button(t, "payments")]])
+    kb = pagination_keyboard(t, f"fee_{period}", page, total_pages, "fee_history")
     await callback.message.edit_text("\n".join(lines), reply_markup=kb)
     await callback.answer()
 
@@ -166,6 +252,7 @@ async def process_pay_card(
     state: FSMContext,
     t: Callable[..., str],
     billing: BillingService,
+    payment_history: PaymentHistoryCache,
     login: str,
     password_md5: str,
     **kwargs,
@@ -177,8 +264,10 @@ async def process_pay_card(
     try:
         result = await billing.client.use_pay_card(login, password_md5, card_number)
         text = result.message or t("payments.card_result")
-    except Exception:
-        text = t("errors.connection")
+    except Exception as e:
+        text = format_error(t, e)
+    finally:
+        await payment_history.invalidate(message.from_user.id, login)
 
     await message.answer(text, reply_markup=payments_menu_keyboard(t))
 
@@ -196,8 +285,8 @@ async def show_payment_systems(
     try:
         systems = await billing.client.get_payment_systems(login, password_md5)
         system_list = [(s.name, s.url) for s in systems if s.url]
-    except Exception:
-        await callback.message.edit_text(t("errors.connection"), reply_markup=payments_menu_keyboard(t))
+    except Exception as e:
+        await callback.message.edit_text(format_error(t, e), reply_markup=payments_menu_keyboard(t))
         await callback.answer()
         return
 
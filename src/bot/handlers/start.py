@@ -11,10 +11,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy import delete
 
-from bot.db import Session, async_session
+from bot.db import Session, async_session, session_cache
 from bot.handlers.menu import show_main_menu
-from bot.services import BillingService
+from bot.services import AccountSnapshotCache, BillingService, Prefetcher
 from bot.states import AuthForm
+from bot.utils.formatting import format_error
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,9 @@ async def cmd_start(
     billing: BillingService,
     command: CommandObject,
     locale: str = "uk",
+    session: Session | None = None,
+    account_snapshots: AccountSnapshotCache | None = None,
+    prefetcher: Prefetcher | None = None,
     **kwargs,
 ) -> None:
     """Обработка команды /start — deep link, меню или авторизация."""
@@ -52,10 +56,17 @@ async def cmd_start(
             await _handle_deeplink_auth(message, state, t, billing, parsed, locale)
             return
 
-    session = kwargs.get("session")
     if session:
         await state.clear()
-        await show_main_menu(message, t, billing, session.login, session.password_md5)
+        await show_main_menu(
+            message,
+            t,
+            billing,
+            session.login,
+            session.password_md5,
+            account_snapshots,
+            prefetcher,
+        )
         return
 
     await state.set_state(AuthForm.waiting_login)
@@ -83,7 +94,7 @@ async def _handle_deeplink_auth(
             return
     except Exception as e:
         logger.exception("Deep link auth error for login=%s: %s", login, e)
-        await message.answer(t("errors.connection"))
+        await message.answer(format_error(t, e))
         await state.set_state(AuthForm.waiting_login)
         await message.answer(t("auth.enter_login"))
         return
@@ -97,6 +108,7 @@ async def _handle_deeplink_auth(
         )
         await db.merge(session)
         await db.commit()
+    session_cache.invalidate(message.from_user.id)
 
     await state.clear()
     await message.answer(t("auth.success"))
@@ -140,7 +152,7 @@ async def process_password(
             return
     except Exception as e:
         logger.exception("Ошибка при авторизации login=%s: %s", login, e)
-        await message.answer(t("errors.connection"))
+        await message.answer(format_error(t, e))
         await state.set_state(AuthForm.waiting_login)
         await message.answer(t("auth.enter_login"))
         return
@@ -154,6 +166,7 @@ async def process_password(
         )
         await db.merge(session)
         await db.commit()
+    session_cache.invalidate(message.from_user.id)
 
     await state.clear()
     await message.answer(t("auth.success"))
@@ -171,6 +184,7 @@ async def cmd_logout(
     async with async_session() as db:
         await db.execute(delete(Session).where(Session.telegram_id == user_id))
         await db.commit()
+    session_cache.invalidate(user_id)
 
     await state.clear()
     text = t("auth.logged_out")
@@ -8,6 +8,7 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup
 from bot.keyboards import tariffs_menu_keyboard
 from bot.keyboards.common import back_button
 from bot.services import BillingService
+from bot.utils.formatting import format_error
 
 router = Router()
 
@@ -31,9 +32,9 @@ async def show_current_tariff(
     """Показывает текущий тариф и услуги."""
     try:
         services = await billing.client.get_tariff_vservices(login, password_md5)
-    except Exception:
+    except Exception as e:
         await callback.message.edit_text(
-            t("errors.connection"), reply_markup=tariffs_menu_keyboard(t)
+            format_error(t, e), reply_markup=tariffs_menu_keyboard(t)
         )
         await callback.answer()
         return
@@ -68,9 +69,9 @@ async def show_available_tariffs(
     """Показывает доступные для смены тарифы."""
     try:
         tariffs = await billing.client.get_allowed_tariffs(login, password_md5)
-    except Exception:
+    except Exception as e:
         await callback.message.edit_text(
-            t("errors.connection"), reply_markup=tariffs_menu_keyboard(t)
+            format_error(t, e), reply_markup=tariffs_menu_keyboard(t)
         )
         await callback.answer()
         return
@@ -103,9 +104,9 @@ async def show_all_tariffs(
     """Показывает все тарифы провайдера."""
     try:
         services = await billing.client.get_active_tariffs_vservices(login, password_md5)
-    except Exception:
+    except Exception as e:
         await callback.message.edit_text(
-            t("errors.connection"), reply_markup=tariffs_menu_keyboard(t)
+            format_error(t, e), reply_markup=tariffs_menu_keyboard(t)
         )
         await callback.answer()
         return
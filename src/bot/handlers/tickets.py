@@ -9,6 +9,7 @@ from aiogram.types import CallbackQuery, Message
 
 from bot.keyboards import ticket_cancel_keyboard, ticket_reply_keyboard, tickets_menu_keyboard
 from bot.services import BillingService
+from bot.utils.formatting import format_error
 from bot.states import TicketForm
 
 logger = logging.getLogger(__name__)
@@ -34,10 +35,10 @@ async def show_tickets_list(
     """Показывает список тикетов."""
     try:
         tickets = await billing.client.get_tickets(login, password_md5)
-    except Exception:
+    except Exception as e:
         logger.exception("Ошибка получения тикетов для login=%s", login)
         await callback.message.edit_text(
-            t("errors.connection"), reply_markup=tickets_menu_keyboard(t)
+            format_error(t, e), reply_markup=tickets_menu_keyboard(t)
         )
         await callback.answer()
         return
@@ -95,8 +96,8 @@ async def process_ticket_text(
     try:
         result = await billing.client.create_ticket(login, password_md5, text)
         response = t("tickets.created", ticket_id=result.id) if result.id else t("tickets.create_error")
-    except Exception:
-        response = t("errors.connection")
+    except Exception as e:
+        response = format_error(t, e)
 
     await message.answer(response, reply_markup=tickets_menu_keyboard(t))
 
@@ -134,7 +135,7 @@ async def process_ticket_reply(
     try:
         result = await billing.client.create_ticket(login, password_md5, text, reply_id=ticket_id)
         response = t("tickets.reply_sent") if result.id else t("tickets.reply_error")
-    except Exception:
-        response = t("errors.connection")
+    except Exception as e:
+        response = format_error(t, e)
 
     await message.answer(response, reply_markup=tickets_menu_keyboard(t))
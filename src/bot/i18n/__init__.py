@@ -1,5 +1,5 @@
 """Модуль локализации."""
 
-from bot.i18n.locale_service import LocaleService
+from bot.i18n.locale_service import LocaleService, Translator
 
-__all__ = ["LocaleService"]
+__all__ = ["LocaleService", "Translator"]
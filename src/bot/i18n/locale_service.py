@@ -5,6 +5,20 @@ from pathlib import Path
 from typing import Any
 
 
+class Translator:
+    """Функция перевода t(), привязанная к локали."""
+
+    __slots__ = ("locale", "service")
+
+    def __init__(self, service: "LocaleService", locale: str) -> None:
+        self.service = service
+        self.locale = locale
+
+    def __call__(self, key: str, **kwargs: Any) -> str:
+        """Возвращает строку по ключу для своей локали."""
+        return self.service.get(self.locale, key, **kwargs)
+
+
 class LocaleService:
     """Сервис для работы с локализацией."""
 
@@ -19,13 +33,38 @@ class LocaleService:
         self._locales_dir = locales_dir
         self._default = default_locale
         self._data: dict[str, dict[str, Any]] = {}
+        self._tables: dict[str, dict[str, tuple[str, bool]]] = {}
+        self._fallback: dict[str, tuple[str, bool]] = {}
+        self._translators: dict[str, Translator] = {}
+        self.generation = 0
 
     def load(self) -> None:
-        """Сканирует locales_dir, загружает все *.json файлы."""
+        """Сканирует locales_dir, загружает все *.json файлы и строит таблицы поиска."""
         self._data.clear()
         for path in self._locales_dir.glob("*.json"):
             code = path.stem
             self._data[code] = json.loads(path.read_text("utf-8"))
+        self._compile()
+        self._translators.clear()
+        self.generation += 1
+
+    def _compile(self) -> None:
+        """
+        Строит плоские таблицы {locale: {'section.key': (строка, есть_подстановки)}}.
+
+        Строки локали по умолчанию заранее подмешаны в каждую таблицу,
+        поэтому get() обходится одним обращением к словарю.
+        """
+        default = _flatten(self._data.get(self._default, {}))
+        self._tables = {code: {**default, **_flatten(data)} for code, data in self._data.items()}
+        self._fallback = self._tables.get(self._default, {})
+
+    def translator(self, locale: str) -> Translator:
+        """Возвращает функцию перевода t() для локали."""
+        translator = self._translators.get(locale)
+        if translator is None:
+            translator = self._translators[locale] = Translator(self, locale)
+        return translator
 
     @property
     def available(self) -> dict[str, str]:
@@ -52,26 +91,28 @@ class LocaleService:
         Returns:
             Локализованная строка с подставленными переменными
         """
-        data = self._data.get(locale) or self._data.get(self._default, {})
-        parts = key.split(".")
-        value: Any = data
-
-        for part in parts:
-            if isinstance(value, dict):
-                value = value.get(part)
-            else:
-                value = None
-                break
-
-        if value is None:
-            if locale != self._default:
-                return self.get(self._default, key, **kwargs)
+        table = self._tables.get(locale) or self._fallback
+        entry = table.get(key)
+        if entry is None:
             return key
 
-        if kwargs:
+        text, is_template = entry
+        if kwargs and is_template:
             try:
-                return str(value).format(**kwargs)
+                return text.format(**kwargs)
             except KeyError:
-                return str(value)
+                return text
+
+        return text
+
 
-        return str(value)
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, tuple[str, bool]]:
+    """Разворачивает вложенный словарь локали в {'section.key': (строка, есть_подстановки)}."""
+    flat: dict[str, tuple[str, bool]] = {}
+    for name, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        elif value is not None:
+            text = str(value)
+            flat[f"{prefix}{name}"] = (text, "{" in text)
+    return flat
@@ -1,5 +1,6 @@
 """Клавиатуры бота."""
 
+from bot.keyboards.alerts import alerts_keyboard
 from bot.keyboards.common import back_button, pagination_keyboard
 from bot.keyboards.freeze import freeze_confirm_keyboard, freeze_menu_keyboard
 from bot.keyboards.language import language_keyboard
@@ -18,6 +19,7 @@ from bot.keyboards.tickets import (
 )
 
 __all__ = [
+    "alerts_keyboard",
     "back_button",
     "fee_period_keyboard",
     "freeze_confirm_keyboard",
@@ -0,0 +1,63 @@
+"""Клавиатура настройки уведомлений."""
+
+from typing import Callable
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.keyboards.cache import cached_keyboard
+from bot.keyboards.common import back_button
+
+BALANCE_PRESETS = (0, 50, 100, 200)
+EXPIRE_PRESETS = (1, 3, 7)
+
+
+def _mark(text: str, selected: bool) -> str:
+    """Отмечает выбранный вариант галочкой."""
+    return f"✅ {text}" if selected else text
+
+
+@cached_keyboard
+def alerts_keyboard(
+    t: Callable[..., str], balance: float | None, expire_days: int | None
+) -> InlineKeyboardMarkup:
+    """
+    Создаёт клавиатуру выбора порогов уведомлений.
+
+    Args:
+        t: Функция перевода
+        balance: Текущий порог баланса (None — выключено)
+        expire_days: Текущий порог дней до окончания (None — выключено)
+    """
+    balance_row = [
+        InlineKeyboardButton(
+            text=_mark(t("alerts.off_btn"), balance is None), callback_data="alert_balance:off"
+        )
+    ]
+    balance_row += [
+        InlineKeyboardButton(
+            text=_mark(str(value), balance == value), callback_data=f"alert_balance:{value}"
+        )
+        for value in BALANCE_PRESETS
+    ]
+
+    expire_row = [
+        InlineKeyboardButton(
+            text=_mark(t("alerts.off_btn"), expire_days is None), callback_data="alert_expire:off"
+        )
+    ]
+    expire_row += [
+        InlineKeyboardButton(
+            text=_mark(str(value), expire_days == value), callback_data=f"alert_expire:{value}"
+        )
+        for value in EXPIRE_PRESETS
+    ]
+
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=t("alerts.balance_header"), callback_data="noop")],
+            balance_row,
+            [InlineKeyboardButton(text=t("alerts.expire_header"), callback_data="noop")],
+            expire_row,
+            [back_button(t, "menu")],
+        ]
+    )
@@ -0,0 +1,82 @@
+"""Мемоизация статических клавиатур по локали и аргументам билдера."""
+
+from functools import wraps
+from typing import Any, Callable, TypeVar
+from weakref import WeakKeyDictionary
+
+from aiogram.types import InlineKeyboardMarkup
+
+from bot.i18n import LocaleService, Translator
+
+F = TypeVar("F", bound=Callable[..., InlineKeyboardMarkup])
+
+
+class KeyboardCache:
+    """
+    Кэш готовых InlineKeyboardMarkup.
+
+    Ключ — (билдер, локаль, аргументы). У каждого LocaleService свой кэш
+    (см. keyboard_cache_for); он сбрасывается целиком, когда
+    LocaleService.load() перезагружает строки (меняется generation).
+    """
+
+    def __init__(self) -> None:
+        self._generation = -1
+        self._entries: dict[tuple, InlineKeyboardMarkup] = {}
+
+    def get_or_build(
+        self, generation: int, key: tuple, build: Callable[[], InlineKeyboardMarkup]
+    ) -> InlineKeyboardMarkup:
+        """Возвращает клавиатуру из кэша или строит и запоминает её."""
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+        markup = self._entries.get(key)
+        if markup is None:
+            markup = self._entries[key] = build()
+        return markup
+
+    def clear(self) -> None:
+        """Полностью очищает кэш."""
+        self._entries.clear()
+
+
+# Кэш живёт, пока жив его LocaleService
+_caches: WeakKeyDictionary[LocaleService, KeyboardCache] = WeakKeyDictionary()
+
+
+def keyboard_cache_for(service: LocaleService) -> KeyboardCache:
+    """Возвращает кэш клавиатур LocaleService: строки и generation у сервисов свои."""
+    cache = _caches.get(service)
+    if cache is None:
+        cache = _caches[service] = KeyboardCache()
+    return cache
+
+
+def _freeze(value: Any) -> Any:
+    """Приводит аргументы билдера к хэшируемому виду, сохраняя порядок."""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cached_keyboard(builder: F) -> F:
+    """
+    Декоратор билдера клавиатуры: одна и та же разметка строится один раз.
+
+    Кэшируется только вызов с Translator — для произвольной функции t()
+    локаль неизвестна, и клавиатура строится заново.
+    """
+
+    @wraps(builder)
+    def wrapper(t: Callable[..., str], *args: Any, **kwargs: Any) -> InlineKeyboardMarkup:
+        if not isinstance(t, Translator):
+            return builder(t, *args, **kwargs)
+        key = (builder.__name__, t.locale, _freeze(args), _freeze(kwargs))
+        return keyboard_cache_for(t.service).get_or_build(
+            t.service.generation, key, lambda: builder(t, *args, **kwargs)
+        )
+
+    return wrapper  # type: ignore[return-value]
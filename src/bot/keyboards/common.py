@@ -16,6 +16,7 @@ def pagination_keyboard(
     current_page: int,
     total_pages: int,
     back_callback: str = "menu",
+    extra_buttons: list[InlineKeyboardButton] | None = None,
 ) -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру с пагинацией.
@@ -26,6 +27,7 @@ def pagination_keyboard(
         current_page: Текущая страница (начиная с 1)
         total_pages: Общее количество страниц
         back_callback: Callback для кнопки назад
+        extra_buttons: Дополнительный ряд кнопок перед кнопкой назад
     """
     buttons: list[InlineKeyboardButton] = []
 
@@ -43,6 +45,8 @@ def pagination_keyboard(
             InlineKeyboardButton(text=" →", callback_data=f"page:{section}:{current_page + 1}")
         )
 
-    return InlineKeyboardMarkup(
-        inline_keyboard=[buttons, [back_button(t, back_callback)]]
-    )
+    rows = [buttons]
+    if extra_buttons:
+        rows.append(extra_buttons)
+    rows.append([back_button(t, back_callback)])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -4,9 +4,11 @@ from typing import Callable
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.keyboards.cache import cached_keyboard
 from bot.keyboards.common import back_button
 
 
+@cached_keyboard
 def freeze_menu_keyboard(
     t: Callable[..., str], can_freeze: bool = True, is_frozen: bool = False
 ) -> InlineKeyboardMarkup:
@@ -34,6 +36,7 @@ def freeze_menu_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def freeze_confirm_keyboard(t: Callable[..., str], action: str) -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру подтверждения заморозки/разморозки.
@@ -4,9 +4,11 @@ from typing import Callable
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.keyboards.cache import cached_keyboard
 from bot.keyboards.common import back_button
 
 
+@cached_keyboard
 def language_keyboard(
     t: Callable[..., str], locales: dict[str, tuple[str, str]]
 ) -> InlineKeyboardMarkup:
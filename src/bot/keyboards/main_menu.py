@@ -4,7 +4,10 @@ from typing import Callable
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.keyboards.cache import cached_keyboard
 
+
+@cached_keyboard
 def main_menu_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт клавиатуру главного меню."""
     return InlineKeyboardMarkup(
@@ -25,6 +28,7 @@ def main_menu_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
                 InlineKeyboardButton(text=t("menu.info"), callback_data="info"),
                 InlineKeyboardButton(text=t("menu.language"), callback_data="language"),
             ],
+            [InlineKeyboardButton(text=t("menu.alerts"), callback_data="alerts")],
             [InlineKeyboardButton(text=t("menu.logout"), callback_data="logout")],
         ]
     )
@@ -4,9 +4,11 @@ from typing import Callable
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.keyboards.cache import cached_keyboard
 from bot.keyboards.common import back_button
 
 
+@cached_keyboard
 def payments_menu_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт меню раздела платежей."""
     return InlineKeyboardMarkup(
@@ -20,6 +22,7 @@ def payments_menu_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     )
 
 
+@cached_keyboard
 def fee_period_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт клавиатуру выбора периода для списаний."""
     return InlineKeyboardMarkup(
@@ -32,6 +35,7 @@ def fee_period_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     )
 
 
+@cached_keyboard
 def pay_card_cancel_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт кнопку отмены для ввода карты оплаты."""
     return InlineKeyboardMarkup(
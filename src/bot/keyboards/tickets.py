@@ -4,9 +4,11 @@ from typing import Callable
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.keyboards.cache import cached_keyboard
 from bot.keyboards.common import back_button
 
 
+@cached_keyboard
 def tickets_menu_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт меню раздела тикетов."""
     return InlineKeyboardMarkup(
@@ -33,6 +35,7 @@ def ticket_reply_keyboard(t: Callable[..., str], ticket_id: int) -> InlineKeyboa
     )
 
 
+@cached_keyboard
 def ticket_cancel_keyboard(t: Callable[..., str]) -> InlineKeyboardMarkup:
     """Создаёт кнопку отмены для создания/ответа на тикет."""
     return InlineKeyboardMarkup(
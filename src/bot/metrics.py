@@ -0,0 +1,186 @@
+"""
+Метрики в формате Prometheus.
+
+Метрики регистрируются в собственном реестре prometheus_client (без
+сборщиков процесса и платформы) и отдаются на /metrics отдельным
+aiohttp-сервером. В режиме worker каждый процесс слушает свой порт:
+METRICS_PORT + номер.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Mapping
+
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiohttp import web
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+registry = CollectorRegistry()
+
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds",
+    "Время выполнения обработчиков aiogram",
+    ("router", "handler"),
+    registry=registry,
+)
+MIDDLEWARE_DURATION = Histogram(
+    "bot_middleware_duration_seconds",
+    "Собственное время middleware без учёта обработчика",
+    ("middleware",),
+    registry=registry,
+)
+BILLING_DURATION = Histogram(
+    "bot_billing_call_duration_seconds",
+    "Время вызовов BillingService.client, включая ответы из кэша",
+    ("method",),
+    registry=registry,
+)
+BILLING_ERRORS = Counter(
+    "bot_billing_call_errors_total",
+    "Ошибки вызовов BillingService.client",
+    ("method", "error"),
+    registry=registry,
+)
+DB_QUERY_DURATION = Histogram(
+    "bot_db_query_duration_seconds",
+    "Время SQL-запросов к PostgreSQL",
+    ("operation",),
+    registry=registry,
+)
+FSM_STORAGE_DURATION = Histogram(
+    "bot_fsm_storage_duration_seconds",
+    "Время обращений к хранилищу FSM",
+    ("operation",),
+    registry=registry,
+)
+UPDATES_QUEUED = Gauge(
+    "bot_updates_queued",
+    "Обновления, ожидающие очереди пользователя или свободного слота",
+    registry=registry,
+)
+UPDATES_IN_PROGRESS = Gauge(
+    "bot_updates_in_progress", "Обновления, которые обрабатываются сейчас", registry=registry
+)
+UPDATES_REJECTED = Counter(
+    "bot_updates_rejected_total",
+    "Обновления, отброшенные из-за переполнения очереди",
+    ("reason",),
+    registry=registry,
+)
+UPDATE_QUEUE_WAIT = Histogram(
+    "bot_update_queue_wait_seconds", "Время ожидания обновления в очереди", registry=registry
+)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    """Запоминает начало SQL-запроса для его курсора."""
+    conn.info.setdefault("query_start", {})[id(cursor)] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    """Записывает длительность SQL-запроса по первому слову запроса."""
+    started = conn.info.get("query_start", {}).pop(id(cursor), None)
+    if started is None:
+        return
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else "?"
+    DB_QUERY_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+
+def _handle_error(context: Any) -> None:
+    """Снимает отметку начала запроса, завершившегося ошибкой."""
+    # after_cursor_execute в этом случае не вызывается
+    if context.connection is None or context.cursor is None:
+        return
+    context.connection.info.get("query_start", {}).pop(id(context.cursor), None)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает замер времени SQL-запросов к engine (повторный вызов ничего не делает)."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class InstrumentedStorage(BaseStorage):
+    """Хранилище FSM, замеряющее время каждого обращения к исходному."""
+
+    def __init__(self, storage: BaseStorage) -> None:
+        """
+        Args:
+            storage: Исходное хранилище FSM
+        """
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Устанавливает состояние FSM."""
+        started = time.perf_counter()
+        try:
+            await self.storage.set_state(key, state)
+        finally:
+            FSM_STORAGE_DURATION.labels("set_state").observe(time.perf_counter() - started)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        """Возвращает состояние FSM."""
+        started = time.perf_counter()
+        try:
+            return await self.storage.get_state(key)
+        finally:
+            FSM_STORAGE_DURATION.labels("get_state").observe(time.perf_counter() - started)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        """Сохраняет данные FSM."""
+        started = time.perf_counter()
+        try:
+            await self.storage.set_data(key, data)
+        finally:
+            FSM_STORAGE_DURATION.labels("set_data").observe(time.perf_counter() - started)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        """Возвращает данные FSM."""
+        started = time.perf_counter()
+        try:
+            return await self.storage.get_data(key)
+        finally:
+            FSM_STORAGE_DURATION.labels("get_data").observe(time.perf_counter() - started)
+
+    async def close(self) -> None:
+        """Закрывает исходное хранилище."""
+        await self.storage.close()
+
+
+@asynccontextmanager
+async def metrics_server(host: str, port: int) -> AsyncIterator[None]:
+    """Поднимает HTTP-сервер с /metrics на время контекста."""
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(
+            body=generate_latest(registry),
+            headers={"Content-Type": CONTENT_TYPE_LATEST},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Метрики доступны на %s:%d/metrics", host, port)
+    try:
+        yield
+    finally:
+        await runner.cleanup()
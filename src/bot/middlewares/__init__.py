@@ -2,5 +2,20 @@
 
 from bot.middlewares.auth import AuthMiddleware
 from bot.middlewares.i18n import LocaleMiddleware
+from bot.middlewares.metrics import HandlerMetricsMiddleware, TimedMiddleware
+from bot.middlewares.outbound import OutboundScheduler, bulk_sending
+from bot.middlewares.prefetch import PrefetchActivityMiddleware
+from bot.middlewares.scheduler import UpdateScheduler
+from bot.middlewares.snapshot import MenuRefreshMiddleware
 
-__all__ = ["AuthMiddleware", "LocaleMiddleware"]
+__all__ = [
+    "AuthMiddleware",
+    "HandlerMetricsMiddleware",
+    "LocaleMiddleware",
+    "MenuRefreshMiddleware",
+    "OutboundScheduler",
+    "PrefetchActivityMiddleware",
+    "TimedMiddleware",
+    "UpdateScheduler",
+    "bulk_sending",
+]
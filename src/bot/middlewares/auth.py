@@ -5,10 +5,9 @@ from typing import Any, Awaitable, Callable
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
-from sqlalchemy import delete, select
 
 from bot.config import settings
-from bot.db import Session, async_session
+from bot.db import get_session
 
 
 class AuthMiddleware(BaseMiddleware):
@@ -27,6 +26,8 @@ class AuthMiddleware(BaseMiddleware):
 
         При валидной сессии добавляет login, password_md5 и session в data.
         Для /start — пропускает без ошибки, но инжектит сессию если она валидна.
+        Сессия берётся из SessionCache; при промахе кэша — из БД.
+        Истёкшие сессии не удаляются здесь — их убирает SessionSweeper.
         """
         user_id = self._get_user_id(event)
         if user_id is None:
@@ -34,20 +35,16 @@ class AuthMiddleware(BaseMiddleware):
 
         is_start = self._is_start_command(event)
 
-        state = data.get("state")
-        if state:
-            current_state = await state.get_state()
-            if current_state and current_state.startswith("AuthForm:"):
-                return await handler(event, data)
+        # Состояние FSM уже прочитано FSMContextMiddleware для фильтров aiogram;
+        # повторный state.get_state() стоил бы ещё одного запроса к Redis
+        raw_state = data.get("raw_state")
+        if raw_state and raw_state.startswith("AuthForm:"):
+            return await handler(event, data)
 
         # Переиспользуем сессию из LocaleMiddleware, если доступна
         session = data.pop("_db_session", None)
         if session is None:
-            async with async_session() as db:
-                result = await db.execute(
-                    select(Session).where(Session.telegram_id == user_id)
-                )
-                session = result.scalar_one_or_none()
+            session = await get_session(user_id)
 
         if session is None:
             if is_start:
@@ -58,11 +55,6 @@ class AuthMiddleware(BaseMiddleware):
         if settings.session_ttl_hours > 0:
             ttl = timedelta(hours=settings.session_ttl_hours)
             if datetime.now(UTC) - session.created_at.replace(tzinfo=UTC) > ttl:
-                async with async_session() as db:
-                    await db.execute(
-                        delete(Session).where(Session.telegram_id == user_id)
-                    )
-                    await db.commit()
                 if is_start:
                     return await handler(event, data)
                 await self._send_session_expired(event, data)
@@ -0,0 +1,21 @@
+"""Общие помощники middleware."""
+
+from typing import Any
+
+from aiogram.dispatcher.event.handler import HandlerObject
+
+# Параметры обработчика, для которых нужна сессия из БД
+SESSION_PARAMS = frozenset({"login", "password_md5", "session"})
+
+
+def handler_needs_session(data: dict[str, Any]) -> bool:
+    """
+    Проверяет, объявляет ли выбранный обработчик зависимость от сессии.
+
+    Смотрит только на явно перечисленные параметры: **kwargs не считается
+    зависимостью. Если обработчик неизвестен, сессия считается нужной.
+    """
+    handler: HandlerObject | None = data.get("handler")
+    if handler is None:
+        return True
+    return not SESSION_PARAMS.isdisjoint(handler.params)
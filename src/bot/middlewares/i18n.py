@@ -1,15 +1,14 @@
 """Middleware локализации."""
 
-from functools import partial
 from typing import Any, Awaitable, Callable
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
-from sqlalchemy import select
 
 from bot.config import settings
-from bot.db import Session, async_session
+from bot.db import Session, get_session, session_cache
 from bot.i18n import LocaleService
+from bot.middlewares.common import handler_needs_session
 
 
 class LocaleMiddleware(BaseMiddleware):
@@ -30,19 +29,19 @@ class LocaleMiddleware(BaseMiddleware):
         Загружает полный объект Session и кэширует его в data["_db_session"],
         чтобы AuthMiddleware мог переиспользовать его без повторного запроса к БД.
         """
-        user_locale, db_session = await self._get_user_locale(event)
+        user_locale, db_session = await self._get_user_locale(event, data)
 
         if db_session is not None:
             data["_db_session"] = db_session
 
         data["locale"] = user_locale
-        data["t"] = partial(self._locale_service.get, user_locale)
+        data["t"] = self._locale_service.translator(user_locale)
         data["locale_service"] = self._locale_service
 
         return await handler(event, data)
 
     async def _get_user_locale(
-        self, event: TelegramObject
+        self, event: TelegramObject, data: dict[str, Any]
     ) -> tuple[str, Session | None]:
         """
         Определяет локаль пользователя.
@@ -52,6 +51,9 @@ class LocaleMiddleware(BaseMiddleware):
         2. Язык из Telegram-профиля (если поддерживается)
         3. Локаль по умолчанию
 
+        Если обработчику сессия не нужна, локаль берётся из кэша; сессия
+        из БД загружается только при промахе кэша.
+
         Returns:
             Кортеж (код локали, объект Session или None)
         """
@@ -59,13 +61,14 @@ class LocaleMiddleware(BaseMiddleware):
         tg_lang = self._get_telegram_language(event)
 
         if user_id:
-            async with async_session() as db:
-                result = await db.execute(
-                    select(Session).where(Session.telegram_id == user_id)
-                )
-                session = result.scalar_one_or_none()
-                if session:
-                    return session.locale, session
+            if not handler_needs_session(data):
+                cached_locale = session_cache.get_locale(user_id)
+                if cached_locale:
+                    return cached_locale, None
+            # Промах кэша локалей: get_session заполняет его заново
+            session = await get_session(user_id)
+            if session:
+                return session.locale, session
 
         if tg_lang and tg_lang in self._locale_service.available:
             return tg_lang, None
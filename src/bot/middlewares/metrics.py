@@ -0,0 +1,70 @@
+"""Middleware сбора метрик обработчиков и других middleware."""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.metrics import HANDLER_DURATION, MIDDLEWARE_DURATION
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Замеряет время обработчика с метками router и handler.
+
+    Регистрируется последним, чтобы оборачивать только сам обработчик.
+    Роутеры в bot.handlers создаются без имени, поэтому меткой router
+    служит имя модуля обработчика (payments, tickets, ...).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = getattr(data.get("handler"), "callback", None)
+        router_name = getattr(callback, "__module__", "?").rpartition(".")[2]
+        handler_name = getattr(callback, "__name__", "?")
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_DURATION.labels(router_name, handler_name).observe(time.perf_counter() - started)
+
+
+class TimedMiddleware(BaseMiddleware):
+    """Обёртка над middleware: замеряет его собственное время без вложенной цепочки."""
+
+    def __init__(self, middleware: BaseMiddleware, name: str | None = None) -> None:
+        """
+        Args:
+            middleware: Оборачиваемый middleware
+            name: Значение метки middleware (по умолчанию — имя класса)
+        """
+        self._middleware = middleware
+        self._name = name or type(middleware).__name__
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        nested = 0.0
+
+        async def timed_handler(event: TelegramObject, data: dict[str, Any]) -> Any:
+            nonlocal nested
+            started = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                nested += time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            return await self._middleware(timed_handler, event, data)
+        finally:
+            MIDDLEWARE_DURATION.labels(self._name).observe(time.perf_counter() - started - nested)
@@ -0,0 +1,161 @@
+"""
+Планировщик исходящих запросов к Telegram Bot API.
+
+Подключается как middleware сессии бота и ограничивает частоту запросов,
+адресованных чатам: глобально и для каждого чата отдельно. Ответы на
+действия пользователя имеют приоритет над массовыми рассылками, а ответ
+TelegramRetryAfter приостанавливает отправку и повторяет запрос.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.utils.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_bulk: ContextVar[bool] = ContextVar("outbound_bulk", default=False)
+
+
+@contextmanager
+def bulk_sending() -> Iterator[None]:
+    """
+    Помечает запросы внутри блока как массовую рассылку (низкий приоритет).
+
+    Использование:
+        with bulk_sending():
+            await bot.send_message(chat_id, text)
+    """
+    token = _bulk.set(True)
+    try:
+        yield
+    finally:
+        _bulk.reset(token)
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    """Ограничивает частоту исходящих запросов к чатам."""
+
+    MAX_CHATS = 10000
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        bulk_reserve: float = 0.2,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        Инициализация планировщика.
+
+        Args:
+            global_rate: Запросов в секунду на весь бот
+            chat_rate: Запросов в секунду в один чат
+            chat_burst: Запас запросов в один чат для коротких всплесков
+            bulk_reserve: Доля глобального лимита, недоступная массовым рассылкам
+            max_retries: Сколько раз повторять запрос после TelegramRetryAfter
+        """
+        self._bulk_reserve = bulk_reserve * global_rate
+        # Запас корзины должен вмещать токен рассылки вместе с резервом,
+        # иначе при global_rate <= 1 рассылка ждала бы вечно
+        self._global = TokenBucket(global_rate, max(global_rate, 1.0 + self._bulk_reserve))
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._chats: OrderedDict[int | str, TokenBucket] = OrderedDict()
+        self._paused_until: dict[int | str, float] = {}
+        self._interactive_waiting = 0
+        # Установлено, когда ни один ответ пользователю не ждёт глобального токена
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+        self._max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """Дожидается своей очереди и выполняет запрос, повторяя его при flood control."""
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        attempt = 0
+        while True:
+            await self._wait_turn(chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as exc:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                logger.warning(
+                    "Flood control для chat_id=%s: пауза %d с (%s)",
+                    chat_id,
+                    exc.retry_after,
+                    type(method).__name__,
+                )
+                self._pause(chat_id, exc.retry_after)
+
+    async def _wait_turn(self, chat_id: int | str) -> None:
+        """Ждёт снятия паузы, токена чата и глобального токена с учётом приоритета."""
+        loop = asyncio.get_running_loop()
+        paused_until = self._paused_until.get(chat_id)
+        if paused_until is not None:
+            delay = paused_until - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._paused_until.get(chat_id, 0.0) <= loop.time():
+                self._paused_until.pop(chat_id, None)
+
+        await self._chat_bucket(chat_id).acquire()
+
+        if _bulk.get():
+            while self._interactive_waiting:
+                await self._interactive_idle.wait()
+            await self._global.acquire(reserve=self._bulk_reserve)
+            return
+
+        self._interactive_waiting += 1
+        self._interactive_idle.clear()
+        try:
+            await self._global.acquire()
+        finally:
+            self._interactive_waiting -= 1
+            if not self._interactive_waiting:
+                self._interactive_idle.set()
+
+    def _pause(self, chat_id: int | str, seconds: float) -> None:
+        """Приостанавливает отправку в чат, попутно удаляя истёкшие паузы других чатов."""
+        now = asyncio.get_running_loop().time()
+        for paused_chat, until in list(self._paused_until.items()):
+            if until <= now:
+                del self._paused_until[paused_chat]
+        self._paused_until[chat_id] = now + seconds
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        """Возвращает корзину чата, вытесняя давно неактивные."""
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self._chat_rate, self._chat_burst)
+            while len(self._chats) > self.MAX_CHATS:
+                oldest, old_bucket = next(iter(self._chats.items()))
+                if not old_bucket.is_full:
+                    break
+                del self._chats[oldest]
+        self._chats.move_to_end(chat_id)
+        return bucket
@@ -0,0 +1,31 @@
+"""Middleware учёта активности пользователя для фоновой загрузки."""
+
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.services.prefetch import Prefetcher
+
+
+class PrefetchActivityMiddleware(BaseMiddleware):
+    """
+    Продлевает фоновую загрузку, пока пользователь активен.
+
+    Регистрируется как outer middleware: любое событие пользователя
+    отсчитывает простой для его загрузки заново.
+    """
+
+    def __init__(self, prefetcher: Prefetcher) -> None:
+        self._prefetcher = prefetcher
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is not None:
+            self._prefetcher.touch(user.id)
+        return await handler(event, data)
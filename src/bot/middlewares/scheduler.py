@@ -0,0 +1,132 @@
+"""Планировщик обработки обновлений: по очереди для пользователя, с общим лимитом."""
+
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.metrics import UPDATE_QUEUE_WAIT, UPDATES_IN_PROGRESS, UPDATES_QUEUED, UPDATES_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+class _UserQueue:
+    """Замок пользователя и число его обновлений, ожидающих или выполняемых."""
+
+    __slots__ = ("lock", "pending")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class UpdateScheduler(BaseMiddleware):
+    """
+    Outer middleware уровня Update.
+
+    Обновления одного пользователя выполняются строго по очереди в порядке
+    поступления: asyncio.Lock отдаёт замок ожидающим по FIFO. Слот общего
+    лимита занимается только после замка пользователя, поэтому очередь
+    одного пользователя не отнимает слоты у остальных.
+
+    Очередь ограничена: обновление сверх max_queued ожидающих (или сверх
+    max_user_queued у одного пользователя) отбрасывается сразу, а нажатие
+    кнопки получает пустой ответ, чтобы у пользователя не крутились часы.
+    Задачи aiogram для отброшенных обновлений завершаются сразу, поэтому
+    число живых задач не превышает concurrency + max_queued.
+
+    Должен регистрироваться до FSMContextMiddleware, чтобы состояние FSM
+    читалось уже под замком пользователя, а не до завершения его
+    предыдущего обновления.
+    """
+
+    def __init__(self, concurrency: int, max_queued: int = 1000, max_user_queued: int = 10) -> None:
+        """
+        Args:
+            concurrency: Максимум одновременно обрабатываемых обновлений
+            max_queued: Максимум обновлений, ожидающих очереди (0 — без ограничения)
+            max_user_queued: Максимум ожидающих обновлений одного пользователя
+                (0 — без ограничения)
+        """
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._max_queued = max_queued
+        self._max_user_queued = max_user_queued
+        self._users: dict[int, _UserQueue] = {}
+        self._queued = 0
+        self._in_progress = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Обновления, ожидающие очереди пользователя или свободного слота."""
+        return self._queued
+
+    @property
+    def in_progress(self) -> int:
+        """Обновления, которые обрабатываются сейчас."""
+        return self._in_progress
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        queue = self._users.get(user.id) if user is not None else None
+
+        if self._max_queued and self._queued >= self._max_queued:
+            return await self._reject(event, "queue_full")
+        # pending включает выполняемое обновление, ожидающих на одно меньше
+        if self._max_user_queued and queue is not None and queue.pending > self._max_user_queued:
+            return await self._reject(event, "user_queue_full")
+
+        if user is not None:
+            if queue is None:
+                queue = self._users[user.id] = _UserQueue()
+            queue.pending += 1
+
+        started = time.perf_counter()
+        waiting = True
+        self._set_queued(1)
+        try:
+            async with queue.lock if queue is not None else nullcontext(), self._semaphore:
+                waiting = False
+                self._set_queued(-1)
+                UPDATE_QUEUE_WAIT.observe(time.perf_counter() - started)
+                self._set_in_progress(1)
+                try:
+                    return await handler(event, data)
+                finally:
+                    self._set_in_progress(-1)
+        finally:
+            if waiting:
+                # Отменено, не дождавшись очереди
+                self._set_queued(-1)
+            if queue is not None:
+                queue.pending -= 1
+                if queue.pending == 0:
+                    del self._users[user.id]
+
+    async def _reject(self, event: TelegramObject, reason: str) -> None:
+        """Отбрасывает обновление; нажатию кнопки отвечает, чтобы снять индикатор загрузки."""
+        UPDATES_REJECTED.labels(reason).inc()
+        logger.debug("Обновление отброшено: %s", reason)
+        if isinstance(event, Update) and event.callback_query is not None:
+            try:
+                await event.callback_query.answer()
+            except Exception:
+                logger.debug("Не удалось ответить на отброшенный callback", exc_info=True)
+
+    def _set_queued(self, delta: int) -> None:
+        """Меняет счётчик ожидающих обновлений и метрику."""
+        self._queued += delta
+        UPDATES_QUEUED.set(self._queued)
+
+    def _set_in_progress(self, delta: int) -> None:
+        """Меняет счётчик выполняемых обновлений и метрику."""
+        self._in_progress += delta
+        UPDATES_IN_PROGRESS.set(self._in_progress)
@@ -0,0 +1,35 @@
+"""Middleware отмены фонового обновления главного меню."""
+
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.services.snapshot import AccountSnapshotCache
+
+
+class MenuRefreshMiddleware(BaseMiddleware):
+    """
+    Отменяет фоновое обновление меню, когда от пользователя приходит новое событие.
+
+    Регистрируется как outer middleware: новое событие почти всегда меняет
+    экран, и запоздавшее обновление не должно перезаписать его меню.
+
+    Задачи обновления хранятся в памяти процесса: отмена работает, когда
+    события пользователя приходят в тот же процесс (polling, ingress +
+    worker), но не между несколькими webhook-репликами.
+    """
+
+    def __init__(self, snapshots: AccountSnapshotCache) -> None:
+        self._snapshots = snapshots
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is not None:
+            self._snapshots.cancel(user.id)
+        return await handler(event, data)
@@ -1,5 +1,23 @@
 """Сервисы приложения."""
 
-from bot.services.billing import BillingService
+from bot.services.billing import BillingService, BillingUnavailableError
+from bot.services.breaker import CircuitBreaker
+from bot.services.cache import ResponseCache
+from bot.services.history import FeeChargeCache, PaymentHistoryCache
+from bot.services.prefetch import Prefetcher
+from bot.services.snapshot import AccountSnapshotCache
+from bot.services.sweeper import SessionSweeper
+from bot.services.watcher import AccountWatcher
 
-__all__ = ["BillingService"]
+__all__ = [
+    "AccountSnapshotCache",
+    "AccountWatcher",
+    "BillingService",
+    "BillingUnavailableError",
+    "CircuitBreaker",
+    "FeeChargeCache",
+    "PaymentHistoryCache",
+    "Prefetcher",
+    "ResponseCache",
+    "SessionSweeper",
+]
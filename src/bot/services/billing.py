@@ -1,42 +1,387 @@
 """Обёртка над UbillingClient."""
 
+import asyncio
+import importlib.util
+import inspect
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, cast
+
+import httpx
 from pyubilling import UbillingClient
 
+from bot.metrics import BILLING_DURATION, BILLING_ERRORS
+from bot.services.breaker import CircuitBreaker
+from bot.services.cache import INVALIDATES, MISS, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class BillingUnavailableError(Exception):
+    """Ubilling недоступен: цепь разомкнута, запрос не отправлялся."""
+
+    # Ключ текста ошибки для format_error: bot.utils не импортирует сервисы
+    locale_key = "errors.unavailable"
+
+
+def _is_outage(exc: BaseException) -> bool:
+    """Говорит ли ошибка о недоступности Ubilling (а не об ошибке в данных запроса)."""
+    while exc is not None:
+        if isinstance(exc, (TimeoutError, OSError, httpx.TransportError)):
+            return True
+        if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500:
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class _ClientProxy:
+    """Прокси над UbillingClient: пропускает вызовы методов через BillingService._call."""
+
+    def __init__(self, service: "BillingService") -> None:
+        self._service = service
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service._raw_client, name)
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            return partial(self._service._call, name)
+        return attr
+
 
 class BillingService:
     """Singleton-сервис для работы с Ubilling API."""
 
-    def __init__(self, url: str, uber_key: str | None = None) -> None:
+    def __init__(
+        self,
+        url: str,
+        uber_key: str | None = None,
+        cache: ResponseCache | None = None,
+        timeout: float | None = None,
+        timeouts: dict[str, float] | None = None,
+        breaker: CircuitBreaker | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        warmup_connections: int = 0,
+    ) -> None:
         """
         Инициализация сервиса.
 
         Args:
             url: URL Ubilling XMLAgent API
             uber_key: MD5 серийного номера для extended auth (опционально)
+            cache: Кэш ответов read-only методов (опционально)
+            timeout: Дедлайн запроса к Ubilling по умолчанию, секунд (None — без дедлайна)
+            timeouts: Дедлайны отдельных методов, секунд
+            breaker: Circuit breaker для запросов к Ubilling (опционально)
+            limits: Лимиты пула соединений httpx (None — по умолчанию httpx)
+            http2: Использовать HTTP/2 (нужен пакет h2)
+            warmup_connections: Сколько соединений открыть заранее при старте
         """
         self._url = url
         self._uber_key = uber_key
+        self._cache = cache
+        self._timeout = timeout
+        self._timeouts = timeouts or {}
+        self._breaker = breaker
+        self._limits = limits
+        self._http2 = http2
+        self._warmup_connections = warmup_connections
         self._client: UbillingClient | None = None
+        self._http: httpx.AsyncClient | None = None
+        self._proxy = _ClientProxy(self)
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._coalesced_calls = 0
 
     async def start(self) -> None:
-        """Инициализирует httpx-клиент."""
+        """Инициализирует httpx-клиент, настраивает пул соединений и прогревает его."""
         self._client = UbillingClient(self._url, uber_key=self._uber_key)
         await self._client.__aenter__()
+        http = self._http = await self._configure_http()
+        if http is not None and self._warmup_connections > 0:
+            await self._warmup(http)
+
+    async def ping(self) -> None:
+        """
+        Проверяет, что Ubilling отвечает по HTTP.
+
+        Любой ответ, кроме 5xx, означает, что сервер доступен: XMLAgent
+        может не поддерживать HEAD.
+
+        Raises:
+            httpx.TransportError: Ubilling недоступен
+            httpx.HTTPStatusError: Ubilling ответил ошибкой 5xx
+        """
+        if self._http is not None:
+            response = await self._http.head(self._url)
+        else:
+            async with httpx.AsyncClient() as http:
+                response = await http.head(self._url)
+        if response.status_code >= 500:
+            response.raise_for_status()
+
+    async def _configure_http(self) -> httpx.AsyncClient | None:
+        """
+        Заменяет httpx-клиент внутри UbillingClient на клиент с нужным пулом.
+
+        UbillingClient не принимает настройки пула, поэтому его httpx.AsyncClient
+        пересоздаётся с полной копией настроек: авторизацией, параметрами,
+        заголовками, cookies, таймаутом, редиректами, event hooks и настройками
+        TLS стандартного транспорта. Клиент со своим транспортом или прокси
+        не трогается: их настройки нельзя перенести без потерь. Версии
+        pyubilling, httpx и httpcore закреплены в pyproject.toml, так что
+        устройство клиента и приватные атрибуты транспорта известны.
+        """
+        for name, http in vars(self._client).items():
+            if isinstance(http, httpx.AsyncClient):
+                break
+        else:
+            logger.warning("BillingService: httpx-клиент в UbillingClient не найден, пул не настроен")
+            return None
+
+        if self._limits is None and not self._http2:
+            return http
+
+        transport = http._transport
+        pool = getattr(transport, "_pool", None)
+        if (
+            type(transport) is not httpx.AsyncHTTPTransport
+            or http._mounts
+            or pool is None
+            or pool._proxy is not None
+        ):
+            logger.warning(
+                "BillingService: у httpx-клиента UbillingClient свой транспорт или прокси, "
+                "пул не настроен"
+            )
+            return http
+
+        http2 = self._http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("BillingService: пакет h2 не установлен, используется HTTP/1.1")
+            http2 = False
+
+        configured = httpx.AsyncClient(
+            auth=http.auth,
+            params=http.params,
+            headers=http.headers,
+            cookies=http.cookies,
+            timeout=http.timeout,
+            follow_redirects=http.follow_redirects,
+            max_redirects=http.max_redirects,
+            event_hooks=http.event_hooks,
+            base_url=http.base_url,
+            trust_env=http.trust_env,
+            default_encoding=http._default_encoding,
+            transport=httpx.AsyncHTTPTransport(
+                verify=pool._ssl_context,
+                http1=pool._http1,
+                http2=http2,
+                limits=self._limits or httpx.Limits(),
+                local_address=pool._local_address,
+                uds=pool._uds,
+                retries=pool._retries,
+                socket_options=pool._socket_options,
+            ),
+        )
+        setattr(self._client, name, configured)
+        await http.aclose()
+        return configured
+
+    async def _warmup(self, http: httpx.AsyncClient) -> None:
+        """Открывает соединения пула заранее, чтобы первые обновления не ждали TCP/TLS."""
+        async def probe() -> bool:
+            try:
+                await http.head(self._url)
+            except httpx.HTTPError:
+                return False
+            return True
+
+        results = await asyncio.gather(*(probe() for _ in range(self._warmup_connections)))
+        logger.info(
+            "BillingService: прогрето соединений — %d из %d",
+            sum(results),
+            self._warmup_connections,
+        )
 
     async def stop(self) -> None:
         """Закрывает httpx-клиент."""
         if self._client:
             await self._client.close()
             self._client = None
+        logger.info("BillingService: объединено одинаковых вызовов — %d", self._coalesced_calls)
 
     @property
     def client(self) -> UbillingClient:
         """
-        Возвращает активный клиент Ubilling.
+        Возвращает клиент Ubilling, вызовы которого проходят через кэш.
 
         Raises:
             RuntimeError: если клиент не инициализирован
         """
+        if self._client is None:
+            raise RuntimeError("BillingService не запущен. Вызовите start() сначала.")
+        return cast(UbillingClient, self._proxy)
+
+    @property
+    def coalesced_calls(self) -> int:
+        """Количество вызовов, получивших результат уже выполняющегося запроса."""
+        return self._coalesced_calls
+
+    @property
+    def available(self) -> bool:
+        """Замкнута ли цепь: фоновые запросы не отправляются, пока Ubilling сбоит."""
+        return self._breaker is None or self._breaker.state == CircuitBreaker.CLOSED
+
+    @property
+    def _raw_client(self) -> UbillingClient:
+        """Возвращает исходный UbillingClient без кэширования."""
         if self._client is None:
             raise RuntimeError("BillingService не запущен. Вызовите start() сначала.")
         return self._client
+
+    async def invalidate(self, login: str, *methods: str) -> None:
+        """Сбрасывает закэшированные ответы указанных методов для login."""
+        if self._cache is not None:
+            await self._cache.invalidate(login, methods)
+
+    async def purge(self, *methods: str) -> int:
+        """Сбрасывает общие для всех абонентов ответы справочных методов."""
+        if self._cache is None:
+            return 0
+        return await self._cache.purge(methods)
+
+    async def prefetch(self, method: str, *args: Any) -> None:
+        """
+        Загружает ответ метода заранее в кэш ответов.
+
+        Ответ хранится с обычным TTL метода; уже закэшированный ответ
+        повторно не запрашивается. Без кэша или для некэшируемого метода
+        ничего не делает.
+        """
+        if self._cache is None or self._cache.ttl_for(method) is None:
+            return
+        await self._call(method, *args)
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет метод клиента и записывает время и ошибки вызова в метрики."""
+        started = time.perf_counter()
+        try:
+            return await self._dispatch(method, *args, **kwargs)
+        except Exception as e:
+            BILLING_ERRORS.labels(method, type(e).__name__).inc()
+            raise
+        finally:
+            BILLING_DURATION.labels(method).observe(time.perf_counter() - started)
+
+    async def _dispatch(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет метод клиента с учётом кэша, инвалидации и объединения запросов."""
+        cache = self._cache
+        login = args[0] if args else kwargs.get("login")
+
+        if method in INVALIDATES:
+            try:
+                return await self._request(method, args, kwargs)
+            finally:
+                if cache is not None and isinstance(login, str):
+                    await cache.invalidate(login, INVALIDATES[method])
+
+        if cache is None or cache.ttl_for(method) is None or not isinstance(login, str):
+            return await self._single_flight(method, args, kwargs)
+
+        tariff = None
+        if cache.scope(method) == "tariff":
+            tariff = await self._cached_tariff(login, args[1:2])
+        key = cache.key(method, login, args[1:], kwargs, tariff=tariff)
+        generation = cache.generation()
+        value = await cache.get(key)
+        if value is MISS:
+            value = await self._single_flight(
+                method, args, kwargs, partial(cache.set, login, method, key, generation=generation)
+            )
+        return value
+
+    async def _cached_tariff(self, login: str, args: tuple) -> str | None:
+        """
+        Тариф абонента из закэшированного get_user_info (без запроса в Ubilling).
+
+        Args:
+            login: Логин абонента
+            args: (password_md5,) — аргументы get_user_info после login
+        """
+        cache = cast(ResponseCache, self._cache)
+        user = await cache.get(cache.key("get_user_info", login, args, {}))
+        if user is MISS:
+            return None
+        return getattr(user, "tariff_name", None) or None
+
+    async def _single_flight(
+        self,
+        method: str,
+        args: tuple,
+        kwargs: dict[str, Any],
+        store: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> Any:
+        """
+        Объединяет одновременные одинаковые вызовы в один запрос к Ubilling.
+
+        Запрос выполняется отдельной задачей, поэтому отмена одного из
+        ожидающих обработчиков не прерывает его для остальных.
+        """
+        key = (method, repr((args, sorted(kwargs.items()))))
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced_calls += 1
+            logger.debug("Ubilling %s: вызов объединён с выполняющимся", method)
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._fetch(method, args, kwargs, store))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        method: str,
+        args: tuple,
+        kwargs: dict[str, Any],
+        store: Callable[[Any], Awaitable[None]] | None,
+    ) -> Any:
+        """Выполняет запрос к Ubilling и сохраняет результат в кэш."""
+        value = await self._request(method, args, kwargs)
+        if store is not None:
+            await store(value)
+        return value
+
+    async def _request(self, method: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        """
+        Выполняет запрос к Ubilling с дедлайном метода через circuit breaker.
+
+        Raises:
+            BillingUnavailableError: цепь разомкнута, запрос не отправлялся
+            TimeoutError: запрос не уложился в дедлайн
+        """
+        breaker = self._breaker
+        if breaker is not None and not breaker.allow():
+            raise BillingUnavailableError(method)
+
+        try:
+            async with asyncio.timeout(self._timeouts.get(method, self._timeout)):
+                value = await getattr(self._raw_client, method)(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Отмена извне (остановка бота, отмена обработчика) ничего не говорит
+            # о доступности Ubilling; превышение дедлайна приходит как TimeoutError
+            if breaker is not None:
+                breaker.record_cancelled()
+            raise
+        except BaseException as e:
+            if breaker is not None:
+                if _is_outage(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_neutral()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return value
@@ -0,0 +1,115 @@
+"""Circuit breaker для вызовов внешнего API."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Размыкает цепь после серии сбоев и не пропускает вызовы до остывания.
+
+    Состояния:
+        closed — вызовы проходят, сбои подряд считаются;
+        open — вызовы отклоняются сразу, пока не пройдёт reset_timeout;
+        half_open — пропускается не больше probes пробных вызовов:
+            успех замыкает цепь, сбой снова размыкает её.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, threshold: int = 5, reset_timeout: float = 30.0, probes: int = 1
+    ) -> None:
+        """
+        Инициализация.
+
+        Args:
+            name: Имя для логов
+            threshold: Сколько сбоев подряд размыкают цепь
+            reset_timeout: Время в разомкнутом состоянии до пробных вызовов, секунд
+            probes: Сколько пробных вызовов допускается одновременно
+        """
+        self._name = name
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._probes = probes
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние с учётом истёкшего времени остывания."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Можно ли выполнить вызов сейчас. При True вызов обязан сообщить результат или отмену."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        if self._state == self.OPEN:
+            self._state = self.HALF_OPEN
+            logger.info("%s: пробные вызовы после остывания", self._name)
+        if self._probes_in_flight >= self._probes:
+            return False
+        self._probes_in_flight += 1
+        return True
+
+    def record_success(self) -> None:
+        """
+        Отмечает успешный вызов.
+
+        В разомкнутом состоянии успех игнорируется: это ответ на вызов,
+        начатый до размыкания, а не проба.
+        """
+        if self._state == self.OPEN:
+            return
+        if self._state == self.HALF_OPEN:
+            logger.info("%s: цепь замкнута", self._name)
+        self._probes_in_flight = 0
+        self._state = self.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Отмечает сбой вызова."""
+        if self._state == self.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._state == self.CLOSED and self._failures >= self._threshold:
+            self._open()
+
+    def record_neutral(self) -> None:
+        """
+        Отмечает ответ с ошибкой в данных запроса (например, 4xx).
+
+        Сервер ответил, поэтому в замкнутом состоянии счётчик сбоев
+        сбрасывается, но пробой в half-open такой ответ не считается:
+        освобождается только слот пробы.
+        """
+        if self._state == self.CLOSED:
+            self._failures = 0
+        else:
+            self.record_cancelled()
+
+    def record_cancelled(self) -> None:
+        """Отмечает вызов, отменённый извне: результата нет, освобождается только слот пробы."""
+        if self._state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def _open(self) -> None:
+        """Размыкает цепь."""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+        self._probes_in_flight = 0
+        logger.warning("%s: цепь разомкнута на %.0f с", self._name, self._reset_timeout)
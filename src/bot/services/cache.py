@@ -0,0 +1,380 @@
+"""Двухуровневый TTL-кэш ответов Ubilling: in-process + Redis."""
+
+import hashlib
+import importlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+# TTL по умолчанию (в секундах) для read-only методов UbillingClient
+DEFAULT_TTLS: dict[str, float] = {
+    "get_user_info": 30,
+    "get_tariff_vservices": 60,
+    "get_payments": 60,
+    "get_fee_charges": 300,
+    "get_tickets": 30,
+    "get_announcements": 300,
+    "get_freeze_data": 30,
+    "check_credit": 30,
+    "get_allowed_tariffs": 300,
+    "get_active_tariffs_vservices": 86400,
+    "get_payment_systems": 86400,
+    "get_agent_data": 86400,
+}
+
+# Справочные методы, ответ которых общий для многих абонентов:
+# "global" — один ответ на всех, login и пароль в ключ не входят;
+# "tariff" — один ответ на тариф абонента из закэшированного get_user_info;
+#   пока get_user_info не в кэше, метод кэшируется как "content";
+# "content" — у login хранится ссылка на ответ, одинаковые ответы хранятся один раз;
+# "login" — обычный кэш по login.
+# Если контрагентов несколько, get_agent_data переключается на "content"
+# через BILLING_CACHE_SHARED.
+SHARED_SCOPES: dict[str, str] = {
+    "get_active_tariffs_vservices": "tariff",
+    "get_payment_systems": "global",
+    "get_agent_data": "global",
+}
+
+# Какие кэшированные методы сбрасывает каждый пишущий вызов.
+# Где сбрасывается get_payments, обработчик сбрасывает и PaymentHistoryCache
+INVALIDATES: dict[str, tuple[str, ...]] = {
+    "freeze_user": ("get_freeze_data", "get_user_info"),
+    "unfreeze_user": ("get_freeze_data", "get_user_info"),
+    "get_credit": ("check_credit", "get_user_info", "get_payments"),
+    "use_pay_card": ("get_user_info", "get_payments"),
+    "create_ticket": ("get_tickets",),
+    "mark_announcements_read": ("get_announcements",),
+}
+
+
+class _Ref:
+    """Ссылка из кэша login на общий ответ в scope "content"."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+
+# Модули, модели которых можно восстанавливать из Redis
+_MODEL_MODULES = ("pyubilling",)
+
+
+def _encode(value: Any) -> Any:
+    """
+    Переводит ответ Ubilling в JSON-совместимый вид.
+
+    Модели pydantic сохраняются как имя класса и model_dump(mode="json").
+
+    Raises:
+        TypeError: значение нельзя сохранить в JSON
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {
+            "__model__": f"{cls.__module__}:{cls.__qualname__}",
+            "data": value.model_dump(mode="json"),
+        }
+    if isinstance(value, _Ref):
+        return {"__ref__": value.key}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return {"__dict__": {k: _encode(v) for k, v in value.items()}}
+    raise TypeError(f"Нельзя сохранить в кэш: {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    """
+    Восстанавливает ответ, сохранённый _encode.
+
+    Raises:
+        ValueError: неизвестный формат или модель вне _MODEL_MODULES
+    """
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__dict__" in value:
+        return {k: _decode(v) for k, v in value["__dict__"].items()}
+    if "__ref__" in value:
+        return _Ref(value["__ref__"])
+    if "__model__" in value:
+        module_name, _, qualname = value["__model__"].partition(":")
+        if module_name.split(".")[0] not in _MODEL_MODULES:
+            raise ValueError(f"Модель вне разрешённых модулей: {value['__model__']}")
+        cls: Any = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            cls = getattr(cls, part)
+        if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+            raise ValueError(f"Не модель pydantic: {value['__model__']}")
+        return cls.model_validate(value["data"])
+    raise ValueError("Неизвестный формат записи кэша")
+
+
+class ResponseCache:
+    """
+    Кэш ответов Ubilling с ключом login + метод + аргументы.
+
+    Первый уровень — LRU-словарь в памяти процесса с коротким TTL,
+    второй — Redis с TTL метода. Ошибки Redis не прерывают обработку:
+    запрос просто уходит в Ubilling. В Redis ответы хранятся в JSON;
+    запись, которую не удалось прочитать (например, после изменения
+    моделей pyubilling), удаляется и считается промахом.
+
+    invalidate() увеличивает поколение login: ответ запроса, начатого до
+    сброса, после него уже не сохраняется.
+
+    Ответы справочных методов (см. SHARED_SCOPES) хранятся в общем для
+    всех абонентов пространстве ключей и сбрасываются через purge().
+    """
+
+    # Сколько последних invalidate() помнить для проверки поколения
+    MAX_INVALIDATED = 10000
+
+    def __init__(
+        self,
+        redis: Redis | None,
+        ttls: dict[str, float],
+        local_size: int = 1024,
+        local_ttl: float = 5.0,
+        prefix: str = "billing",
+        shared: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            redis: Клиент Redis (None — только in-process уровень)
+            ttls: TTL в секундах для каждого кэшируемого метода
+            local_size: Максимум записей в in-process уровне
+            local_ttl: Верхняя граница TTL in-process уровня
+            prefix: Префикс ключей в Redis
+            shared: Scope общего кэша для справочных методов (см. SHARED_SCOPES)
+        """
+        self._redis = redis
+        self._ttls = {method: ttl for method, ttl in ttls.items() if ttl > 0}
+        self._local: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._local_size = local_size
+        self._local_ttl = local_ttl
+        self._prefix = prefix
+        self._shared = {
+            method: scope
+            for method, scope in (shared or {}).items()
+            if scope in ("global", "tariff", "content")
+        }
+        # Поколение кэша: растёт при каждом invalidate()
+        self._generation = 0
+        # {login: поколение последнего invalidate()}
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+
+    def generation(self) -> int:
+        """Текущее поколение; передаётся в set() для ответа, запрошенного сейчас."""
+        return self._generation
+
+    def ttl_for(self, method: str) -> float | None:
+        """Возвращает TTL метода или None, если метод не кэшируется."""
+        return self._ttls.get(method)
+
+    def scope(self, method: str) -> str:
+        """Возвращает scope метода (см. SHARED_SCOPES)."""
+        return self._shared.get(method, "login")
+
+    def key(
+        self, method: str, login: str, args: tuple, kwargs: dict[str, Any], tariff: str | None = None
+    ) -> str:
+        """
+        Строит ключ кэша; пароль и прочие аргументы попадают в хэш.
+
+        Для scope "global" ключ не зависит от login и пароля: args
+        начинаются с password_md5, как во всех методах UbillingClient.
+        Для scope "tariff" так же, но в ключ входит тариф абонента; без
+        тарифа ключ строится как для "content".
+        """
+        scope = self.scope(method)
+        if scope == "global" or (scope == "tariff" and tariff is not None):
+            kwargs = {name: value for name, value in kwargs.items() if name != "password_md5"}
+            shared_args = args[1:] if scope == "global" else (tariff, *args[1:])
+            return f"{self._shared_key(method)}:{self._digest(shared_args, kwargs)}"
+        return f"{self._index_key(login, method)}:{self._digest(args, kwargs)}"
+
+    async def get(self, key: str) -> Any:
+        """Возвращает значение из кэша или MISS."""
+        value = await self._get(key)
+        if isinstance(value, _Ref):
+            value = await self._get(value.key)
+        return value
+
+    async def _get(self, key: str) -> Any:
+        """Читает значение по ключу без разрешения ссылок."""
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+
+        if self._redis is None:
+            return MISS
+
+        try:
+            raw = await self._redis.get(key)
+        except Exception:
+            logger.warning("Кэш Ubilling: Redis недоступен при чтении %s", key, exc_info=True)
+            return MISS
+        if raw is None:
+            return MISS
+
+        try:
+            value = _decode(json.loads(raw))
+        except Exception:
+            logger.warning("Кэш Ubilling: повреждённая запись %s удалена", key, exc_info=True)
+            try:
+                await self._redis.delete(key)
+            except Exception:
+                pass
+            return MISS
+        self._set_local(key, value, self._local_ttl)
+        return value
+
+    async def set(
+        self, login: str, method: str, key: str, value: Any, generation: int | None = None
+    ) -> None:
+        """
+        Сохраняет значение на TTL метода.
+
+        Args:
+            generation: generation() на момент начала запроса; если после
+                него для login был invalidate(), значение не сохраняется
+        """
+        ttl = self._ttls.get(method)
+        if ttl is None:
+            return
+        if generation is not None and self._invalidated.get(login, -1) > generation:
+            return
+        expire = int(ttl) or 1
+        try:
+            raw = json.dumps(_encode(value)).encode()
+        except TypeError:
+            logger.debug("Кэш Ubilling: ответ %s не сохраняется", method, exc_info=True)
+            return
+
+        # (ключ, значение, множество-индекс для сброса)
+        entries: list[tuple[str, Any, str]] = []
+        scope = self.scope(method)
+        if key.startswith(f"{self._shared_key(method)}:"):
+            entries.append((key, value, self._shared_key(method)))
+        elif scope in ("tariff", "content"):
+            shared_key = f"{self._shared_key(method)}:{hashlib.sha1(raw).hexdigest()[:16]}"
+            entries.append((shared_key, value, self._shared_key(method)))
+            entries.append((key, _Ref(shared_key), self._index_key(login, method)))
+        else:
+            entries.append((key, value, self._index_key(login, method)))
+
+        for entry_key, entry_value, _ in entries:
+            self._set_local(entry_key, entry_value, min(ttl, self._local_ttl))
+
+        if self._redis is None:
+            return
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for entry_key, entry_value, index in entries:
+                    payload = raw if entry_value is value else json.dumps(_encode(entry_value))
+                    pipe.set(entry_key, payload, ex=expire)
+                    pipe.sadd(index, entry_key)
+                    pipe.expire(index, expire)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Кэш Ubilling: Redis недоступен при записи %s", key, exc_info=True)
+
+    async def invalidate(self, login: str, methods: tuple[str, ...]) -> None:
+        """Удаляет все закэшированные ответы указанных методов для login."""
+        self._generation += 1
+        self._invalidated[login] = self._generation
+        self._invalidated.move_to_end(login)
+        while len(self._invalidated) > self.MAX_INVALIDATED:
+            self._invalidated.popitem(last=False)
+        for method in methods:
+            prefix = f"{self._index_key(login, method)}:"
+            for key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[key]
+
+        if self._redis is None:
+            return
+
+        try:
+            for method in methods:
+                index = self._index_key(login, method)
+                keys = await self._redis.smembers(index)
+                await self._redis.delete(index, *keys)
+        except Exception:
+            logger.warning("Кэш Ubilling: не удалось сбросить %s для login=%s", methods, login, exc_info=True)
+
+    async def purge(self, methods: tuple[str, ...]) -> int:
+        """
+        Сбрасывает общие ответы справочных методов для всех абонентов.
+
+        Ссылки из кэша login после этого указывают в пустоту, и следующий
+        вызов метода уходит в Ubilling.
+
+        Returns:
+            Количество удалённых ключей в Redis
+        """
+        for method in methods:
+            prefix = f"{self._shared_key(method)}:"
+            for key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[key]
+
+        if self._redis is None:
+            return 0
+
+        deleted = 0
+        try:
+            for method in methods:
+                index = self._shared_key(method)
+                keys = await self._redis.smembers(index)
+                await self._redis.delete(index, *keys)
+                deleted += len(keys)
+        except Exception:
+            logger.warning("Кэш Ubilling: не удалось сбросить общие ответы %s", methods, exc_info=True)
+        return deleted
+
+    def _set_local(self, key: str, value: Any, ttl: float) -> None:
+        """Кладёт значение в in-process уровень с вытеснением по LRU."""
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self._local_size:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _digest(args: tuple, kwargs: dict[str, Any]) -> str:
+        """Хэш аргументов вызова."""
+        raw = repr((args, sorted(kwargs.items()))).encode()
+        return hashlib.sha1(raw).hexdigest()[:16]
+
+    def _index_key(self, login: str, method: str) -> str:
+        """Ключ множества, индексирующего ответы метода для login."""
+        return f"{self._prefix}:{login}:{method}"
+
+    def _shared_key(self, method: str) -> str:
+        """
+        Ключ множества, индексирующего общие ответы метода.
+
+        Префикс "<prefix>-shared:" не начинается с "<prefix>:", поэтому не
+        пересекается с ключами абонентов ни при каком login.
+        """
+        return f"{self._prefix}-shared:{method}"
@@ -0,0 +1,189 @@
+"""Кэш подготовленных историй платежей и списаний в Redis."""
+
+import json
+import logging
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentHistoryCache:
+    """
+    Хранит отсортированную историю платежей пользователя на короткий TTL.
+
+    Первая страница загружает историю из Ubilling и сохраняет её сюда,
+    переходы по страницам читают уже отсортированный список.
+    """
+
+    def __init__(self, redis: Redis, ttl: int = 300) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            redis: Клиент Redis
+            ttl: Время жизни сохранённой истории в секундах
+        """
+        self._redis = redis
+        self._ttl = ttl
+
+    async def get(self, telegram_id: int, login: str) -> tuple[list[dict[str, Any]], float] | None:
+        """Возвращает (строки истории, время загрузки) или None."""
+        try:
+            raw = await self._redis.get(self._key(telegram_id, login))
+        except Exception:
+            logger.warning("История платежей: Redis недоступен", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return payload["rows"], payload["fetched_at"]
+
+    async def set(self, telegram_id: int, login: str, rows: list[dict[str, Any]]) -> float:
+        """Сохраняет строки истории и возвращает время загрузки."""
+        fetched_at = time.time()
+        payload = json.dumps({"fetched_at": fetched_at, "rows": rows}, default=str)
+        try:
+            await self._redis.set(self._key(telegram_id, login), payload, ex=self._ttl)
+        except Exception:
+            logger.warning("История платежей: Redis недоступен", exc_info=True)
+        return fetched_at
+
+    async def invalidate(self, telegram_id: int, login: str) -> None:
+        """Удаляет историю после операций, меняющих платежи (кредит, карта оплаты)."""
+        try:
+            await self._redis.delete(self._key(telegram_id, login))
+        except Exception:
+            logger.warning("История платежей: Redis недоступен", exc_info=True)
+
+    def _key(self, telegram_id: int, login: str) -> str:
+        """Ключ истории для пользователя и его текущего логина."""
+        return f"payments:{telegram_id}:{login}"
+
+
+def _month(day: date) -> str:
+    """Месяц даты в виде YYYY-MM."""
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _month_bounds(month: str) -> tuple[date, date]:
+    """Первый и последний день месяца YYYY-MM."""
+    year, number = map(int, month.split("-"))
+    first = date(year, number, 1)
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+def _months(date_from: date, date_to: date) -> list[str]:
+    """Месяцы, которые затрагивает период, по возрастанию."""
+    months = []
+    day = date_from.replace(day=1)
+    while day <= date_to:
+        months.append(_month(day))
+        day = (day + timedelta(days=32)).replace(day=1)
+    return months
+
+
+class FeeChargeCache:
+    """
+    Хранит списания пользователя помесячно.
+
+    Закрытые месяцы уже не меняются и хранятся долго, текущий — на
+    короткий TTL. Период собирается из закэшированных месяцев, а
+    недостающие загружаются из Ubilling одним запросом.
+    """
+
+    def __init__(self, redis: Redis, current_ttl: int = 300, closed_ttl: int = 2592000) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            redis: Клиент Redis
+            current_ttl: Время жизни списаний текущего месяца в секундах
+            closed_ttl: Время жизни списаний закрытых месяцев в секундах
+        """
+        self._redis = redis
+        self._current_ttl = current_ttl
+        self._closed_ttl = closed_ttl
+
+    async def load(
+        self,
+        telegram_id: int,
+        login: str,
+        date_from: date,
+        date_to: date,
+        fetch: Callable[[date, date], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """
+        Возвращает списания за период, новые сначала.
+
+        Args:
+            telegram_id: ID пользователя Telegram
+            login: Логин абонента
+            date_from: Начало периода
+            date_to: Конец периода (включительно)
+            fetch: Загрузка списаний из Ubilling за период
+        """
+        today = date.today()
+        months = _months(date_from, min(date_to, today))
+        cached = await self._get_months(telegram_id, login, months)
+
+        missing = [month for month in months if month not in cached]
+        if missing:
+            first, _ = _month_bounds(missing[0])
+            _, last = _month_bounds(missing[-1])
+            rows = await fetch(first, min(last, today))
+            fetched: dict[str, list[dict[str, Any]]] = {month: [] for month in missing}
+            for row in rows:
+                month = (row.get("date") or "")[:7]
+                if not month:
+                    # Списания без даты относятся к последнему загруженному месяцу
+                    fetched[missing[-1]].append(row)
+                elif month in fetched:
+                    fetched[month].append(row)
+                # Строки месяцев внутри диапазона, которые уже есть в кэше, пропускаются
+            await self._set_months(telegram_id, login, fetched, today)
+            cached.update(fetched)
+
+        start, end = date_from.isoformat(), date_to.isoformat()
+        charges = [
+            row
+            for month in months
+            for row in cached[month]
+            if not row.get("date") or start <= row["date"][:10] <= end
+        ]
+        return sorted(charges, key=lambda row: row.get("date") or "", reverse=True)
+
+    async def _get_months(
+        self, telegram_id: int, login: str, months: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Закэшированные месяцы из months."""
+        try:
+            values = await self._redis.mget([self._key(telegram_id, login, m) for m in months])
+        except Exception:
+            logger.warning("Списания: Redis недоступен", exc_info=True)
+            return {}
+        pairs = zip(months, values, strict=True)
+        return {month: json.loads(raw) for month, raw in pairs if raw is not None}
+
+    async def _set_months(
+        self, telegram_id: int, login: str, months: dict[str, list[dict[str, Any]]], today: date
+    ) -> None:
+        """Сохраняет месяцы; месяц закрыт, если прошло больше суток после его конца."""
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for month, rows in months.items():
+                    _, last = _month_bounds(month)
+                    ttl = self._closed_ttl if today - last > timedelta(days=1) else self._current_ttl
+                    payload = json.dumps(rows, default=str)
+                    pipe.set(self._key(telegram_id, login, month), payload, ex=ttl)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Списания: Redis недоступен", exc_info=True)
+
+    def _key(self, telegram_id: int, login: str, month: str) -> str:
+        """Ключ списаний пользователя за месяц."""
+        return f"fees:{telegram_id}:{login}:{month}"
@@ -0,0 +1,91 @@
+"""Фоновая загрузка данных экранов, которые обычно открывают после главного меню."""
+
+import asyncio
+import logging
+
+from bot.services.billing import BillingService
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """
+    Заранее загружает ответы Ubilling для следующих экранов пользователя.
+
+    Запросы идут с низким приоритетом: общий семафор ограничивает их число
+    на весь процесс, а всё, что не успело загрузиться за idle_timeout
+    простоя пользователя, отменяется — он, скорее всего, уже никуда не
+    перейдёт. Каждое событие пользователя (touch) отсчитывает простой
+    заново. Ответы попадают в кэш ответов Ubilling (ResponseCache) с
+    обычным TTL метода и отдаются обработчикам вместо запроса к Ubilling.
+    """
+
+    def __init__(
+        self,
+        billing: BillingService,
+        methods: list[str],
+        concurrency: int = 4,
+        idle_timeout: float = 20.0,
+    ) -> None:
+        """
+        Инициализация.
+
+        Args:
+            billing: Сервис Ubilling
+            methods: Методы UbillingClient с аргументами (login, password_md5)
+            concurrency: Одновременных фоновых запросов на весь процесс
+            idle_timeout: Сколько секунд простоя пользователя ждать загрузку
+        """
+        self._billing = billing
+        self._methods = methods
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._idle_timeout = idle_timeout
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._deadlines: dict[int, asyncio.Timeout] = {}
+
+    def schedule(self, telegram_id: int, login: str, password_md5: str) -> None:
+        """Запускает фоновую загрузку для пользователя, заменяя предыдущую."""
+        if not self._methods or not self._billing.available:
+            return
+        previous = self._tasks.pop(telegram_id, None)
+        if previous is not None:
+            previous.cancel()
+
+        task = asyncio.create_task(self._run(telegram_id, login, password_md5))
+        self._tasks[telegram_id] = task
+        task.add_done_callback(
+            lambda _: self._tasks.pop(telegram_id, None)
+            if self._tasks.get(telegram_id) is task
+            else None
+        )
+
+    def touch(self, telegram_id: int) -> None:
+        """Отмечает событие пользователя: простой для его загрузки отсчитывается заново."""
+        deadline = self._deadlines.get(telegram_id)
+        if deadline is not None:
+            deadline.reschedule(asyncio.get_running_loop().time() + self._idle_timeout)
+
+    async def _run(self, telegram_id: int, login: str, password_md5: str) -> None:
+        """Загружает все методы, пока пользователь не ушёл в простой."""
+        deadline = None
+        try:
+            async with asyncio.timeout(self._idle_timeout) as deadline:
+                self._deadlines[telegram_id] = deadline
+                await asyncio.gather(
+                    *(self._prefetch(method, login, password_md5) for method in self._methods)
+                )
+        except TimeoutError:
+            logger.debug("Предзагрузка для %s отменена по простою", login)
+        finally:
+            if self._deadlines.get(telegram_id) is deadline:
+                self._deadlines.pop(telegram_id, None)
+
+    async def _prefetch(self, method: str, login: str, password_md5: str) -> None:
+        """Загружает один метод в пределах общего бюджета фоновых запросов."""
+        async with self._semaphore:
+            if not self._billing.available:
+                return
+            try:
+                await self._billing.prefetch(method, login, password_md5)
+            except Exception:
+                logger.debug("Предзагрузка %s для %s не удалась", method, login, exc_info=True)
@@ -0,0 +1,75 @@
+"""Последний известный снимок аккаунта для мгновенной отрисовки главного меню."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class AccountSnapshotCache:
+    """
+    Хранит поля аккаунта, которые показывает главное меню.
+
+    Меню отрисовывается из снимка сразу, а свежие данные загружаются
+    фоновой задачей. Задача отменяется, если пользователь успел перейти
+    к другому экрану, чтобы не перезаписать его меню.
+    """
+
+    def __init__(self, redis: Redis, ttl: int = 86400) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            redis: Клиент Redis
+            ttl: Время жизни снимка в секундах
+        """
+        self._redis = redis
+        self._ttl = ttl
+        self._refreshes: dict[int, asyncio.Task] = {}
+
+    async def get(self, telegram_id: int, login: str) -> tuple[dict[str, Any], float] | None:
+        """Возвращает (снимок, время загрузки) или None."""
+        try:
+            raw = await self._redis.get(self._key(telegram_id, login))
+        except Exception:
+            logger.warning("Снимок аккаунта: Redis недоступен", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return payload["snapshot"], payload["fetched_at"]
+
+    async def set(self, telegram_id: int, login: str, snapshot: dict[str, Any]) -> float:
+        """Сохраняет снимок и возвращает время загрузки."""
+        fetched_at = time.time()
+        payload = json.dumps({"fetched_at": fetched_at, "snapshot": snapshot}, default=str)
+        try:
+            await self._redis.set(self._key(telegram_id, login), payload, ex=self._ttl)
+        except Exception:
+            logger.warning("Снимок аккаунта: Redis недоступен", exc_info=True)
+        return fetched_at
+
+    def track(self, telegram_id: int, task: asyncio.Task) -> None:
+        """Запоминает фоновое обновление меню пользователя, отменяя предыдущее."""
+        self.cancel(telegram_id)
+        self._refreshes[telegram_id] = task
+        task.add_done_callback(
+            lambda _: self._refreshes.pop(telegram_id, None)
+            if self._refreshes.get(telegram_id) is task
+            else None
+        )
+
+    def cancel(self, telegram_id: int) -> None:
+        """Отменяет фоновое обновление меню пользователя, если оно идёт."""
+        task = self._refreshes.pop(telegram_id, None)
+        if task is not None:
+            task.cancel()
+
+    def _key(self, telegram_id: int, login: str) -> str:
+        """Ключ снимка для пользователя и его текущего логина."""
+        return f"snapshot:{telegram_id}:{login}"
@@ -0,0 +1,67 @@
+"""Периодическое удаление истёкших сессий."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from bot.db import Session, async_session
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """
+    Удаляет истёкшие сессии порциями.
+
+    Каждая порция — отдельная короткая транзакция, поэтому таблица
+    не блокируется надолго даже при большом числе истёкших строк.
+    Выборка идёт по индексу на created_at.
+    """
+
+    def __init__(self, ttl_hours: int, interval: float = 600, batch_size: int = 1000) -> None:
+        """
+        Инициализация очистки.
+
+        Args:
+            ttl_hours: Время жизни сессии в часах
+            interval: Период между очистками, секунд
+            batch_size: Максимум строк, удаляемых одним запросом
+        """
+        self._ttl = timedelta(hours=ttl_hours)
+        self._interval = interval
+        self._batch_size = batch_size
+
+    async def run(self) -> None:
+        """Запускает очистку каждые interval секунд до отмены задачи."""
+        while True:
+            try:
+                removed = await self.sweep()
+                if removed:
+                    logger.info("Удалено истёкших сессий: %d", removed)
+            except Exception:
+                logger.exception("Ошибка очистки истёкших сессий")
+            await asyncio.sleep(self._interval)
+
+    async def sweep(self) -> int:
+        """Удаляет все сессии старше TTL и возвращает их количество."""
+        cutoff = datetime.now(UTC) - self._ttl
+        expired = (
+            select(Session.telegram_id)
+            .where(Session.created_at < cutoff)
+            .limit(self._batch_size)
+            .scalar_subquery()
+        )
+        stmt = delete(Session).where(Session.telegram_id.in_(expired))
+
+        removed = 0
+        while True:
+            async with async_session() as db:
+                result = await db.execute(stmt, execution_options={"synchronize_session": False})
+                await db.commit()
+            removed += result.rowcount
+            if result.rowcount < self._batch_size:
+                return removed
+            # Отдаём цикл событий обработчикам между порциями
+            await asyncio.sleep(0)
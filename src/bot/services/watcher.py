@@ -0,0 +1,204 @@
+"""Фоновая проверка аккаунтов и уведомления о низком балансе и окончании услуги."""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, AsyncIterator
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError
+from redis.asyncio import Redis
+from sqlalchemy import Row, or_, select
+
+from bot.config import settings
+from bot.db import Session, async_read_session
+from bot.i18n import LocaleService
+from bot.middlewares.outbound import bulk_sending
+from bot.services.billing import BillingService, BillingUnavailableError
+from bot.utils.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def _to_float(value: Any) -> float | None:
+    """Преобразует сумму из Ubilling в число."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value: Any) -> date | None:
+    """Извлекает дату из поля Ubilling ('YYYY-MM-DD[ ...]'), '0' и пустые — None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class AccountWatcher:
+    """
+    Периодически проверяет аккаунты с включёнными уведомлениями.
+
+    Сессии читаются из БД порциями по telegram_id, запросы к Ubilling
+    выполняет ограниченный пул воркеров с общим лимитом частоты.
+    Повторное уведомление одного типа не отправляется чаще, чем раз
+    в cooldown секунд. Сообщения уходят как массовая рассылка, чтобы
+    не мешать ответам на действия пользователей.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        billing: BillingService,
+        locale_service: LocaleService,
+        redis: Redis,
+        interval: float = 3600,
+        chunk_size: int = 500,
+        concurrency: int = 8,
+        rate: float = 5.0,
+        cooldown: int = 86400,
+    ) -> None:
+        """
+        Инициализация наблюдателя.
+
+        Args:
+            bot: Экземпляр бота для отправки уведомлений
+            billing: Сервис Ubilling
+            locale_service: Сервис локализации
+            redis: Клиент Redis для дедупликации уведомлений
+            interval: Период между началами проверок, секунд
+            chunk_size: Сколько сессий читать из БД за один запрос
+            concurrency: Количество одновременных запросов к Ubilling
+            rate: Лимит запросов к Ubilling в секунду
+            cooldown: Минимальный интервал между одинаковыми уведомлениями, секунд
+        """
+        self._bot = bot
+        self._billing = billing
+        self._locale_service = locale_service
+        self._redis = redis
+        self._interval = interval
+        self._chunk_size = chunk_size
+        self._concurrency = concurrency
+        self._bucket = TokenBucket(rate)
+        self._cooldown = cooldown
+
+    async def run(self) -> None:
+        """Запускает проверки каждые interval секунд до отмены задачи."""
+        while True:
+            started = time.monotonic()
+            try:
+                checked = await self.run_cycle()
+                logger.info(
+                    "Проверка аккаунтов: %d за %.1f с", checked, time.monotonic() - started
+                )
+            except Exception:
+                logger.exception("Ошибка фоновой проверки аккаунтов")
+            await asyncio.sleep(max(0.0, self._interval - (time.monotonic() - started)))
+
+    async def run_cycle(self) -> int:
+        """Проверяет все сессии с включёнными уведомлениями, возвращает их количество."""
+        queue: asyncio.Queue[Row] = asyncio.Queue(maxsize=self._concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self._concurrency)]
+        checked = 0
+        try:
+            async for row in self._iter_sessions():
+                await queue.put(row)
+                checked += 1
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return checked
+
+    async def _iter_sessions(self) -> AsyncIterator[Row]:
+        """Читает подходящие сессии порциями, не загружая таблицу целиком."""
+        stmt = (
+            select(
+                Session.telegram_id,
+                Session.login,
+                Session.password_md5,
+                Session.locale,
+                Session.alert_balance,
+                Session.alert_expire_days,
+            )
+            .where(or_(Session.alert_balance.is_not(None), Session.alert_expire_days.is_not(None)))
+            .order_by(Session.telegram_id)
+            .limit(self._chunk_size)
+        )
+        if settings.session_ttl_hours > 0:
+            cutoff = datetime.now(UTC) - timedelta(hours=settings.session_ttl_hours)
+            stmt = stmt.where(Session.created_at > cutoff)
+
+        last_id: int | None = None
+        while True:
+            chunk = stmt if last_id is None else stmt.where(Session.telegram_id > last_id)
+            async with async_read_session() as db:
+                rows = (await db.execute(chunk)).all()
+            for row in rows:
+                yield row
+            if len(rows) < self._chunk_size:
+                return
+            last_id = rows[-1].telegram_id
+
+    async def _worker(self, queue: "asyncio.Queue[Row]") -> None:
+        """Обрабатывает сессии из очереди."""
+        while True:
+            row = await queue.get()
+            try:
+                await self._check(row)
+            except BillingUnavailableError:
+                logger.debug("Ubilling недоступен, аккаунт login=%s пропущен", row.login)
+            except Exception:
+                logger.warning("Не удалось проверить аккаунт login=%s", row.login, exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _check(self, row: Row) -> None:
+        """Запрашивает данные аккаунта и отправляет уведомления при пересечении порогов."""
+        await self._bucket.acquire()
+        user = await self._billing.client.get_user_info(row.login, row.password_md5)
+        t = self._locale_service.translator(row.locale)
+
+        if row.alert_balance is not None:
+            cash = _to_float(user.cash)
+            if cash is not None and cash < row.alert_balance:
+                text = t(
+                    "alerts.low_balance",
+                    cash=user.cash,
+                    currency=user.currency or "грн",
+                    threshold=f"{row.alert_balance:g}",
+                )
+                await self._notify(row.telegram_id, "balance", text)
+
+        if row.alert_expire_days is not None:
+            expire = _to_date(user.account_expire)
+            if expire is not None:
+                days_left = (expire - date.today()).days
+                if 0 <= days_left <= row.alert_expire_days:
+                    text = t("alerts.expiring", date=expire.isoformat(), days=days_left)
+                    await self._notify(row.telegram_id, "expire", text)
+
+    async def _notify(self, telegram_id: int, kind: str, text: str) -> None:
+        """
+        Отправляет уведомление, если такое же не отправлялось в пределах cooldown.
+
+        Cooldown ставится только после успешной отправки: неотправленное
+        уведомление повторится при следующей проверке.
+        """
+        key = f"alerts:{telegram_id}:{kind}"
+        if await self._redis.exists(key):
+            return
+        with bulk_sending():
+            try:
+                await self._bot.send_message(telegram_id, text)
+            except TelegramForbiddenError:
+                logger.info("Пользователь %d заблокировал бота, уведомление пропущено", telegram_id)
+                return
+        await self._redis.set(key, 1, ex=self._cooldown)
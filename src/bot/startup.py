@@ -0,0 +1,87 @@
+"""Замеры фаз запуска и проверка готовности внешних сервисов."""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class StartupError(Exception):
+    """Внешний сервис не готов к работе при запуске."""
+
+
+class StartupTimer:
+    """Длительности фаз запуска процесса для одной строки в логе."""
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замеряет фазу запуска."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Добавляет длительность уже замеренной фазы."""
+        self._phases.append((name, seconds))
+
+    def log(self) -> None:
+        """Пишет в лог общее время запуска и длительности фаз."""
+        total = time.perf_counter() - self._started
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} мс" for name, seconds in self._phases)
+        logger.info("Запуск за %.0f мс: %s", total * 1000, phases)
+
+
+# Создаётся при первом импорте bot.startup — в самом начале bot.__main__
+timer = StartupTimer()
+
+
+def setup_logging() -> None:
+    """Настраивает корневой логгер по LOG_LEVEL."""
+    from bot.config import settings
+
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper(), logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+
+async def check_ready(checks: dict[str, Awaitable[Any]], timeout: float) -> None:
+    """
+    Выполняет проверки готовности сервисов одновременно.
+
+    Длительность каждой проверки добавляется в timer.
+
+    Args:
+        checks: {имя сервиса: корутина, которая подключается к нему}
+        timeout: Предельное время каждой проверки, секунд
+
+    Raises:
+        StartupError: со списком всех сервисов, которые не ответили или вернули ошибку
+    """
+
+    async def run(name: str, check: Awaitable[Any]) -> str | None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await check
+        except TimeoutError:
+            return f"{name}: нет ответа за {timeout:g} с"
+        except Exception as e:
+            return f"{name}: {type(e).__name__}: {e}"
+        finally:
+            timer.add(name, time.perf_counter() - started)
+        return None
+
+    results = await asyncio.gather(*(run(name, check) for name, check in checks.items()))
+    errors = [error for error in results if error is not None]
+    if errors:
+        raise StartupError("Сервисы не готовы — " + "; ".join(errors))
@@ -0,0 +1,358 @@
+"""
+Очередь обновлений на Redis Streams.
+
+Ingress-процесс принимает webhook от Telegram и раскладывает сырые
+обновления по шардам-стримам по telegram_id. Пул воркер-процессов читает
+стримы через consumer group: каждый шард принадлежит ровно одному
+воркеру и обрабатывается последовательно, поэтому обновления одного
+пользователя не обгоняют друг друга. Неподтверждённые сообщения
+упавшего воркера забираются через XAUTOCLAIM.
+
+Внутри воркера обновления разных пользователей обрабатываются
+одновременно (до STREAM_CONCURRENCY на процесс), обновления одного
+пользователя — по очереди. Каждое обновление подтверждается, когда
+завершилась его собственная обработка.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import secrets
+import signal
+import sys
+from contextlib import nullcontext
+from functools import partial
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from bot.config import settings
+from bot.metrics import metrics_server
+from bot.startup import StartupError, setup_logging, timer
+from bot.webhook import wait_for_shutdown
+
+logger = logging.getLogger(__name__)
+
+GROUP = "bot-workers"
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def stream_key(shard: int) -> str:
+    """Имя стрима для шарда."""
+    return f"updates:{shard}"
+
+
+def sender_id(update: dict[str, Any]) -> int | None:
+    """telegram_id отправителя обновления или None."""
+    for key, event in update.items():
+        if key == "update_id" or not isinstance(event, dict):
+            continue
+        user = event.get("from") or event.get("user") or event.get("chat") or {}
+        if isinstance(user, dict) and isinstance(user.get("id"), int):
+            return user["id"]
+    return None
+
+
+def shard_for(update: dict[str, Any], shards: int) -> int:
+    """
+    Вычисляет шард обновления по telegram_id отправителя.
+
+    Обновления без отправителя распределяются по update_id.
+    """
+    user_id = sender_id(update)
+    if user_id is not None:
+        return user_id % shards
+    return int(update.get("update_id", 0)) % shards
+
+
+async def run_ingress(bot: Bot) -> None:
+    """
+    Тонкий приёмник webhook: проверяет секрет и кладёт обновление в стрим.
+
+    Работает до SIGTERM или отмены задачи.
+    """
+    redis = Redis.from_url(settings.redis_url)
+
+    async def handle(request: web.Request) -> web.Response:
+        token = request.headers.get(SECRET_HEADER, "")
+        if not secrets.compare_digest(token, settings.webhook_secret or ""):
+            return web.Response(status=401)
+        body = await request.read()
+        try:
+            update = json.loads(body)
+        except ValueError:
+            return web.Response(status=400)
+        # Ответ 500 Telegram повторял бы бесконечно
+        if not isinstance(update, dict) or not isinstance(update.get("update_id"), int):
+            return web.Response(status=400)
+        shard = shard_for(update, settings.stream_shards)
+        await redis.xadd(
+            stream_key(shard),
+            {"update": body},
+            maxlen=settings.stream_maxlen,
+            approximate=True,
+        )
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(settings.webhook_path, handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    await site.start()
+    logger.info(
+        "Ingress слушает %s:%d%s, шардов: %d",
+        settings.webhook_host,
+        settings.webhook_port,
+        settings.webhook_path,
+        settings.stream_shards,
+    )
+
+    try:
+        await bot.set_webhook(
+            url=settings.webhook_base_url.rstrip("/") + settings.webhook_path,
+            secret_token=settings.webhook_secret,
+        )
+        await wait_for_shutdown()
+    finally:
+        await runner.cleanup()
+        await redis.aclose()
+
+
+class ShardConsumer:
+    """
+    Обрабатывает один шард-стрим внутри воркера.
+
+    Обновление пользователя запускается после завершения его предыдущего
+    обновления, обновления разных пользователей идут одновременно.
+    Общий для воркера семафор slots ограничивает число обновлений в работе:
+    пока свободного слота нет, новые сообщения из стрима не читаются.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        bot: Bot,
+        dp: Dispatcher,
+        shard: int,
+        consumer: str,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        self._redis = redis
+        self._bot = bot
+        self._dp = dp
+        self._stream = stream_key(shard)
+        self._consumer = consumer
+        self._slots = slots
+        # Последняя задача каждого пользователя: следующая ждёт её завершения
+        self._tails: dict[int, asyncio.Task] = {}
+        self._in_flight: dict[bytes, asyncio.Task] = {}
+
+    async def run(self) -> None:
+        """Читает стрим до отмены задачи."""
+        await self._ensure_group()
+        # Сначала дочитываем собственные неподтверждённые сообщения
+        await self._drain_pending()
+
+        loop = asyncio.get_running_loop()
+        next_claim = loop.time() + settings.stream_claim_idle_ms / 1000
+        while True:
+            if loop.time() >= next_claim:
+                await self._claim_abandoned()
+                next_claim = loop.time() + settings.stream_claim_idle_ms / 1000
+
+            response = await self._redis.xreadgroup(
+                GROUP,
+                self._consumer,
+                {self._stream: ">"},
+                count=settings.stream_batch_size,
+                block=1000,
+            )
+            for _, entries in response:
+                await self._process(entries)
+
+    async def _ensure_group(self) -> None:
+        """Создаёт consumer group, если её ещё нет."""
+        try:
+            await self._redis.xgroup_create(self._stream, GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def _drain_pending(self) -> None:
+        """Обрабатывает сообщения, выданные этому consumer, но не подтверждённые."""
+        while True:
+            response = await self._redis.xreadgroup(
+                GROUP,
+                self._consumer,
+                {self._stream: "0"},
+                count=settings.stream_batch_size,
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                return
+            await self._process(entries)
+            # Неподтверждённые сообщения перечитываются с начала: ждём,
+            # пока текущие подтвердятся, чтобы не запустить их повторно
+            await self._wait_idle()
+
+    async def _claim_abandoned(self) -> None:
+        """Забирает сообщения, зависшие у других (упавших) consumer."""
+        start = "0-0"
+        while True:
+            result = await self._redis.xautoclaim(
+                self._stream,
+                GROUP,
+                self._consumer,
+                min_idle_time=settings.stream_claim_idle_ms,
+                start_id=start,
+                count=settings.stream_batch_size,
+            )
+            start, entries = result[0], result[1]
+            if entries:
+                logger.warning("%s: забрано %d зависших обновлений", self._stream, len(entries))
+                await self._process(entries)
+            if start in (b"0-0", "0-0"):
+                return
+
+    async def _process(self, entries: list[tuple[bytes, dict[bytes, bytes]]]) -> None:
+        """Запускает обработку обновлений, сохраняя порядок для каждого пользователя."""
+        for entry_id, fields in entries:
+            if entry_id in self._in_flight:
+                # Уже обрабатывается здесь, XAUTOCLAIM вернул его из-за долгого обработчика
+                continue
+            try:
+                raw = json.loads(fields[b"update"]) if fields else None
+            except ValueError:
+                logger.error("%s: обновление %s не JSON, пропущено", self._stream, entry_id)
+                raw = None
+            user_id = sender_id(raw) if isinstance(raw, dict) else None
+
+            await self._slots.acquire()
+            previous = self._tails.get(user_id) if user_id is not None else None
+            task = asyncio.create_task(self._handle(entry_id, raw, previous))
+            self._in_flight[entry_id] = task
+            if user_id is not None:
+                self._tails[user_id] = task
+            task.add_done_callback(partial(self._done, entry_id, user_id))
+
+    async def _handle(
+        self, entry_id: bytes, raw: dict[str, Any] | None, previous: asyncio.Task | None
+    ) -> None:
+        """Дожидается предыдущего обновления пользователя, обрабатывает и подтверждает."""
+        if previous is not None:
+            await asyncio.wait([previous])
+        if raw is not None:
+            try:
+                update = Update.model_validate(raw)
+                await self._dp.feed_update(self._bot, update)
+            except Exception:
+                logger.exception("%s: ошибка обработки обновления %s", self._stream, entry_id)
+        try:
+            await self._redis.xack(self._stream, GROUP, entry_id)
+        except Exception:
+            # Не подтверждённое сообщение заберёт XAUTOCLAIM
+            logger.warning("%s: не удалось подтвердить %s", self._stream, entry_id, exc_info=True)
+
+    def _done(self, entry_id: bytes, user_id: int | None, task: asyncio.Task) -> None:
+        """Освобождает слот и забывает завершённую задачу."""
+        self._slots.release()
+        self._in_flight.pop(entry_id, None)
+        if user_id is not None and self._tails.get(user_id) is task:
+            del self._tails[user_id]
+
+    async def _wait_idle(self) -> None:
+        """Ждёт завершения всех запущенных обновлений шарда."""
+        if self._in_flight:
+            await asyncio.wait(list(self._in_flight.values()))
+
+    async def close(self) -> None:
+        """Отменяет незавершённые обновления: они останутся неподтверждёнными."""
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_worker(index: int, workers: int) -> None:
+    """Запускает воркер, обслуживающий шарды shard % workers == index."""
+    with timer.phase("импорт"):
+        from bot.app import bot_app
+
+    shards = [s for s in range(settings.stream_shards) if s % workers == index]
+    consumer = f"worker-{index}"
+    redis = Redis.from_url(settings.redis_url)
+
+    metrics = (
+        metrics_server(settings.metrics_host, settings.metrics_port + index)
+        if settings.metrics_enabled
+        else nullcontext()
+    )
+    async with bot_app(background_tasks=index == 0) as (bot, dp), metrics:
+        logger.info("Воркер %s запущен, шарды: %s", consumer, shards)
+        slots = asyncio.Semaphore(settings.stream_concurrency)
+        consumers = [
+            ShardConsumer(redis, bot, dp, shard, consumer, slots) for shard in shards
+        ]
+        try:
+            await asyncio.gather(*(c.run() for c in consumers))
+        finally:
+            await asyncio.gather(*(c.close() for c in consumers))
+            await redis.aclose()
+
+
+def _worker_process(index: int, workers: int) -> None:
+    """Точка входа дочернего процесса воркера."""
+    setup_logging()
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(run_worker(index, workers))
+    except KeyboardInterrupt:
+        pass
+    except StartupError as e:
+        logger.error("%s", e)
+        sys.exit(1)
+
+
+def run_worker_pool() -> None:
+    """
+    Запускает STREAM_WORKERS процессов-воркеров и перезапускает упавшие.
+
+    Блокирует до SIGINT/SIGTERM, после чего останавливает дочерние процессы.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    workers = settings.stream_workers
+    processes: dict[int, multiprocessing.process.BaseProcess] = {}
+
+    def spawn(index: int) -> None:
+        process = ctx.Process(
+            target=_worker_process, args=(index, workers), name=f"worker-{index}"
+        )
+        process.start()
+        processes[index] = process
+
+    for index in range(workers):
+        spawn(index)
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        while True:
+            for index, process in list(processes.items()):
+                process.join(timeout=1 / workers)
+                if not process.is_alive():
+                    logger.error(
+                        "Воркер %d завершился с кодом %s, перезапуск", index, process.exitcode
+                    )
+                    spawn(index)
+    except KeyboardInterrupt:
+        logger.info("Остановка пула воркеров")
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
@@ -1,6 +1,6 @@
 """Вспомогательные утилиты."""
 
-from bot.utils.formatting import format_user_info
+from bot.utils.formatting import format_age, format_error, format_user_info
 from bot.utils.pagination import paginate
 
-__all__ = ["format_user_info", "paginate"]
+__all__ = ["format_age", "format_error", "format_user_info", "paginate"]
@@ -1,8 +1,34 @@
 """Утилиты для форматирования сообщений."""
 
+import time
 from typing import Any, Callable
 
 
+def format_error(t: Callable[..., str], exc: BaseException) -> str:
+    """
+    Текст ошибки запроса к Ubilling.
+
+    Исключение может указать свой ключ локали атрибутом locale_key
+    (так BillingUnavailableError сообщает о разомкнутой цепи).
+    """
+    return t(getattr(exc, "locale_key", "errors.connection"))
+
+
+def format_age(t: Callable[..., str], fetched_at: float, key: str) -> str:
+    """
+    Строка о давности загруженных данных.
+
+    Args:
+        t: Функция перевода
+        fetched_at: Время загрузки (time.time())
+        key: Префикс ключей локали: {key}_just_now и {key}_ago с параметром minutes
+    """
+    minutes = int(time.time() - fetched_at) // 60
+    if minutes < 1:
+        return t(f"{key}_just_now")
+    return t(f"{key}_ago", minutes=minutes)
+
+
 def format_user_info(t: Callable[..., str], user: Any, tariff_name: str | None = None) -> str:
     """
     Форматирует краткую информацию о пользователе для главного меню.
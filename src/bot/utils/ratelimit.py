@@ -0,0 +1,62 @@
+"""Асинхронный token bucket для ограничения частоты запросов."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket: rate токенов в секунду, не больше capacity в запасе.
+
+    Параметр reserve позволяет низкоприоритетным потребителям брать токен
+    только тогда, когда после этого в корзине остаётся запас для остальных.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        Инициализация корзины.
+
+        Args:
+            rate: Скорость пополнения, токенов в секунду
+            capacity: Максимальный запас токенов (по умолчанию — rate, но не меньше 1)
+        """
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    @property
+    def is_full(self) -> bool:
+        """Корзина полностью пополнена (давно не использовалась)."""
+        self._refill()
+        return self._tokens >= self._capacity
+
+    def try_take(self, reserve: float = 0.0) -> float:
+        """
+        Берёт токен, если после этого в корзине останется не меньше reserve.
+
+        Returns:
+            0, если токен взят, иначе сколько секунд подождать до следующей попытки
+
+        Raises:
+            ValueError: 1 + reserve больше capacity — токен не взять никогда
+        """
+        need = 1.0 + reserve
+        if need > self._capacity:
+            raise ValueError(f"Резерв {reserve} не помещается в корзину ёмкостью {self._capacity}")
+        self._refill()
+        if self._tokens >= need:
+            self._tokens -= 1.0
+            return 0.0
+        return (need - self._tokens) / self._rate
+
+    async def acquire(self, reserve: float = 0.0) -> None:
+        """Ждёт, пока не удастся взять токен."""
+        while (delay := self.try_take(reserve)) > 0:
+            await asyncio.sleep(delay)
+
+    def _refill(self) -> None:
+        """Пополняет корзину пропорционально прошедшему времени."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
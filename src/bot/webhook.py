@@ -0,0 +1,68 @@
+"""Приём обновлений Telegram через webhook (aiohttp-сервер)."""
+
+import asyncio
+import logging
+import signal
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def wait_for_shutdown() -> None:
+    """
+    Ждёт SIGTERM (остановка контейнера) или отмены задачи.
+
+    SIGINT по-прежнему обрабатывает asyncio.run: он отменяет главную задачу.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        await stop.wait()
+        logger.info("Получен SIGTERM, остановка")
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """
+    Поднимает aiohttp-сервер и регистрирует webhook в Telegram.
+
+    Telegram получает ответ сразу после проверки секрета, обработчики
+    выполняются в фоне. Работает до SIGTERM или отмены задачи, затем
+    останавливает сервер и вызывает shutdown-хуки Dispatcher.
+    """
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=settings.webhook_secret,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    await site.start()
+    logger.info(
+        "Webhook-сервер слушает %s:%d%s",
+        settings.webhook_host,
+        settings.webhook_port,
+        settings.webhook_path,
+    )
+
+    try:
+        await bot.set_webhook(
+            url=settings.webhook_base_url.rstrip("/") + settings.webhook_path,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        await wait_for_shutdown()
+    finally:
+        await runner.cleanup()
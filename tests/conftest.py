@@ -0,0 +1,93 @@
+"""Общие фикстуры тестов."""
+
+import os
+import time
+from typing import Any
+
+import pytest
+
+# Settings читается при импорте bot.config: задаём обязательные поля до импорта бота
+os.environ.setdefault("BOT_TOKEN", "123456:test")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bot@localhost/bot")
+os.environ.setdefault("UBILLING_URL", "http://ubilling.test")
+
+
+class FakeClock:
+    """Подменяет time.monotonic: время идёт только через advance()."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Управляемые часы; asyncio.sleep и таймауты с ними не работают."""
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+class FakePipeline:
+    """Pipeline FakeRedis: команды выполняются сразу."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self._redis.data[key] = value
+
+    def sadd(self, key: str, *members: str) -> None:
+        self._redis.sets.setdefault(key, set()).update(members)
+
+    def expire(self, key: str, seconds: int) -> None:
+        return None
+
+    async def execute(self) -> list[Any]:
+        return []
+
+
+class FakeRedis:
+    """Минимальная замена redis.asyncio.Redis для кэшей и стримов."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.acked: list[bytes] = []
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            deleted += self.data.pop(key, None) is not None
+            deleted += self.sets.pop(key, None) is not None
+        return deleted
+
+    async def smembers(self, key: str) -> set[str]:
+        return set(self.sets.get(key, set()))
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def xack(self, stream: str, group: str, *ids: bytes) -> int:
+        self.acked.extend(ids)
+        return len(ids)
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    """Пустой FakeRedis."""
+    return FakeRedis()
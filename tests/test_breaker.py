@@ -0,0 +1,85 @@
+"""Тесты CircuitBreaker."""
+
+from typing import Any
+
+from bot.services.breaker import CircuitBreaker
+
+
+def _opened(clock: Any, **kwargs: Any) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", threshold=2, reset_timeout=30, **kwargs)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_opens_after_threshold_failures_in_a_row() -> None:
+    """Цепь размыкается после threshold сбоев подряд; успех обнуляет счётчик."""
+    breaker = CircuitBreaker("test", threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_probe_closes_on_success(clock: Any) -> None:
+    """После остывания пропускается одна проба; её успех замыкает цепь."""
+    breaker = _opened(clock)
+    clock.advance(30)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_half_open_probe_failure_reopens(clock: Any) -> None:
+    """Сбой пробы снова размыкает цепь на reset_timeout."""
+    breaker = _opened(clock)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.advance(29)
+    assert not breaker.allow()
+
+
+def test_success_while_open_is_ignored(clock: Any) -> None:
+    """Ответ на вызов, начатый до размыкания, не замыкает цепь."""
+    breaker = _opened(clock)
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_neutral_response_is_not_a_successful_probe(clock: Any) -> None:
+    """Ошибка в данных запроса в half-open освобождает слот, но не замыкает цепь."""
+    breaker = _opened(clock)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_neutral()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_neutral_response_resets_failures_when_closed() -> None:
+    """В замкнутом состоянии ответ сервера обнуляет серию сбоев."""
+    breaker = CircuitBreaker("test", threshold=2)
+    breaker.record_failure()
+    breaker.record_neutral()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_frees_slot(clock: Any) -> None:
+    """Отменённая проба освобождает слот для следующей."""
+    breaker = _opened(clock)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_cancelled()
+    assert breaker.allow()
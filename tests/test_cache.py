@@ -0,0 +1,305 @@
+"""Тесты ResponseCache и объединения запросов в BillingService."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+import pyubilling
+from pydantic import BaseModel
+
+from bot.services.billing import BillingService
+from bot.services.cache import DEFAULT_TTLS, MISS, SHARED_SCOPES, ResponseCache
+
+
+class Account(BaseModel):
+    """Модель ответа Ubilling для тестов."""
+
+    login: str
+    cash: float
+    tariff_name: str | None = None
+
+
+@pytest.fixture(autouse=True)
+def account_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Регистрирует Account как модель pyubilling: только такие восстанавливаются из Redis."""
+    monkeypatch.setattr(Account, "__module__", "pyubilling")
+    monkeypatch.setattr(pyubilling, "Account", Account, raising=False)
+
+
+def _cache(redis: Any = None, **kwargs: Any) -> ResponseCache:
+    return ResponseCache(redis, DEFAULT_TTLS, shared=SHARED_SCOPES, **kwargs)
+
+
+def test_local_layer_without_redis() -> None:
+    """Без Redis ответы хранятся в памяти процесса."""
+
+    async def scenario() -> None:
+        cache = _cache()
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        assert await cache.get(key) is MISS
+        await cache.set("alice", "get_user_info", key, Account(login="alice", cash=10))
+        assert await cache.get(key) == Account(login="alice", cash=10)
+
+    asyncio.run(scenario())
+
+
+def test_local_layer_expires(clock: Any) -> None:
+    """Запись in-process уровня живёт не дольше local_ttl."""
+
+    async def scenario() -> None:
+        cache = _cache(local_ttl=5.0)
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        await cache.set("alice", "get_user_info", key, 1)
+        clock.advance(4.9)
+        assert await cache.get(key) == 1
+        clock.advance(0.2)
+        assert await cache.get(key) is MISS
+
+    asyncio.run(scenario())
+
+
+def test_uncached_method_is_not_stored() -> None:
+    """Методы без TTL не кэшируются."""
+
+    async def scenario() -> None:
+        cache = _cache()
+        assert cache.ttl_for("freeze_user") is None
+        key = cache.key("freeze_user", "alice", ("md5",), {})
+        await cache.set("alice", "freeze_user", key, "ok")
+        assert await cache.get(key) is MISS
+
+    asyncio.run(scenario())
+
+
+def test_redis_round_trip_restores_models(redis: Any) -> None:
+    """Модели pyubilling сохраняются в Redis как JSON и восстанавливаются."""
+
+    async def scenario() -> None:
+        cache = _cache(redis)
+        key = cache.key("get_payments", "alice", ("md5",), {})
+        value = [Account(login="alice", cash=1.5), {"total": 2}]
+        await cache.set("alice", "get_payments", key, value)
+        json.loads(redis.data[key])
+
+        fresh = _cache(redis)
+        assert await fresh.get(key) == value
+
+    asyncio.run(scenario())
+
+
+def test_unreadable_entry_is_dropped(redis: Any) -> None:
+    """Повреждённая запись удаляется из Redis и считается промахом."""
+
+    async def scenario() -> None:
+        cache = _cache(redis)
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        redis.data[key] = b"\x80not json"
+        assert await cache.get(key) is MISS
+        assert key not in redis.data
+
+    asyncio.run(scenario())
+
+
+def test_foreign_model_is_not_restored(redis: Any) -> None:
+    """Из Redis восстанавливаются только модели pyubilling."""
+
+    async def scenario() -> None:
+        cache = _cache(redis)
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        redis.data[key] = json.dumps({"__model__": "os:system", "data": {}}).encode()
+        assert await cache.get(key) is MISS
+        assert key not in redis.data
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_removes_login_entries(redis: Any) -> None:
+    """invalidate() удаляет ответы метода login из обоих уровней."""
+
+    async def scenario() -> None:
+        cache = _cache(redis)
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        other = cache.key("get_user_info", "bob", ("md5",), {})
+        await cache.set("alice", "get_user_info", key, 1)
+        await cache.set("bob", "get_user_info", other, 2)
+
+        await cache.invalidate("alice", ("get_user_info",))
+
+        assert await cache.get(key) is MISS
+        assert key not in redis.data
+        assert await cache.get(other) == 2
+
+    asyncio.run(scenario())
+
+
+def test_store_started_before_invalidate_is_skipped() -> None:
+    """Ответ запроса, начатого до invalidate(), не сохраняется."""
+
+    async def scenario() -> None:
+        cache = _cache()
+        key = cache.key("get_user_info", "alice", ("md5",), {})
+        generation = cache.generation()
+        await cache.invalidate("alice", ("get_user_info",))
+        await cache.set("alice", "get_user_info", key, "stale", generation=generation)
+        assert await cache.get(key) is MISS
+
+        await cache.set("alice", "get_user_info", key, "fresh", generation=cache.generation())
+        assert await cache.get(key) == "fresh"
+
+    asyncio.run(scenario())
+
+
+def test_global_scope_ignores_login_and_password() -> None:
+    """Ответ в scope "global" один для всех абонентов."""
+    cache = _cache()
+    first = cache.key("get_payment_systems", "alice", ("md5-a",), {})
+    second = cache.key("get_payment_systems", "bob", ("md5-b",), {})
+    assert first == second
+
+
+def test_tariff_scope_keys_on_tariff() -> None:
+    """Scope "tariff" делит ответ между абонентами одного тарифа."""
+    cache = _cache()
+    alice = cache.key("get_active_tariffs_vservices", "alice", ("md5-a",), {}, tariff="Home")
+    bob = cache.key("get_active_tariffs_vservices", "bob", ("md5-b",), {}, tariff="Home")
+    carol = cache.key("get_active_tariffs_vservices", "carol", ("md5-c",), {}, tariff="Office")
+    unknown = cache.key("get_active_tariffs_vservices", "alice", ("md5-a",), {})
+    assert alice == bob != carol
+    assert unknown.startswith("billing:alice:")
+
+
+def test_content_scope_stores_equal_answers_once(redis: Any) -> None:
+    """Scope "content": одинаковые ответы разных абонентов хранятся один раз."""
+
+    async def scenario() -> None:
+        cache = ResponseCache(redis, DEFAULT_TTLS, shared={"get_agent_data": "content"})
+        alice = cache.key("get_agent_data", "alice", ("md5-a",), {})
+        bob = cache.key("get_agent_data", "bob", ("md5-b",), {})
+        await cache.set("alice", "get_agent_data", alice, {"name": "ISP"})
+        await cache.set("bob", "get_agent_data", bob, {"name": "ISP"})
+
+        assert len(redis.sets["billing-shared:get_agent_data"]) == 1
+        assert await _cache(redis).get(bob) == {"name": "ISP"}
+
+        assert await cache.purge(("get_agent_data",)) == 1
+        assert await _cache(redis).get(bob) is MISS
+
+    asyncio.run(scenario())
+
+
+class FakeUbilling:
+    """Подмена BillingService._request: считает запросы и ждёт release."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, tuple]] = []
+        self.release = asyncio.Event()
+        self.value: Any = Account(login="alice", cash=1, tariff_name="Home")
+
+    async def __call__(self, method: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        self.calls.append((method, args))
+        await self.release.wait()
+        return self.value
+
+
+def _billing(cache: ResponseCache | None = None) -> tuple[BillingService, FakeUbilling]:
+    billing = BillingService("http://ubilling.test", cache=cache)
+    fake = FakeUbilling()
+    billing._request = fake  # type: ignore[method-assign]
+    return billing, fake
+
+
+def test_single_flight_coalesces_identical_calls() -> None:
+    """Одновременные одинаковые вызовы порождают один запрос."""
+
+    async def scenario() -> None:
+        billing, fake = _billing()
+        calls = [asyncio.create_task(billing._call("get_user_info", "alice", "md5")) for _ in range(5)]
+        other = asyncio.create_task(billing._call("get_user_info", "bob", "md5"))
+        await asyncio.sleep(0)
+        fake.release.set()
+        results = await asyncio.gather(*calls, other)
+
+        assert len(fake.calls) == 2
+        assert all(result is fake.value for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_survives_waiter_cancellation() -> None:
+    """Отмена одного ожидающего не прерывает запрос для остальных."""
+
+    async def scenario() -> None:
+        billing, fake = _billing()
+        first = asyncio.create_task(billing._call("get_user_info", "alice", "md5"))
+        second = asyncio.create_task(billing._call("get_user_info", "alice", "md5"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        fake.release.set()
+
+        assert await second is fake.value
+        assert first.cancelled()
+        assert len(fake.calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cache_hit_skips_request() -> None:
+    """Повторный вызов кэшируемого метода берётся из кэша."""
+
+    async def scenario() -> None:
+        billing, fake = _billing(_cache())
+        fake.release.set()
+        await billing._call("get_user_info", "alice", "md5")
+        await billing._call("get_user_info", "alice", "md5")
+        assert len(fake.calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_write_invalidates_cached_reads() -> None:
+    """Пишущий вызов сбрасывает зависящие от него ответы."""
+
+    async def scenario() -> None:
+        billing, fake = _billing(_cache())
+        fake.release.set()
+        await billing._call("get_user_info", "alice", "md5")
+        await billing._call("freeze_user", "alice", "md5")
+        await billing._call("get_user_info", "alice", "md5")
+        assert [method for method, _ in fake.calls] == ["get_user_info", "freeze_user", "get_user_info"]
+
+    asyncio.run(scenario())
+
+
+def test_fetch_racing_a_write_is_not_cached() -> None:
+    """Ответ, запрошенный до пишущего вызова, не попадает в кэш после него."""
+
+    async def scenario() -> None:
+        billing, fake = _billing(_cache())
+        read = asyncio.create_task(billing._call("get_user_info", "alice", "md5"))
+        await asyncio.sleep(0)
+        await billing.invalidate("alice", "get_user_info")
+        fake.release.set()
+        await read
+
+        await billing._call("get_user_info", "alice", "md5")
+        assert len(fake.calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_tariff_catalog_shared_after_user_info_is_cached() -> None:
+    """Каталог тарифов берётся из кэша тарифа без запроса для нового абонента."""
+
+    async def scenario() -> None:
+        billing, fake = _billing(_cache())
+        fake.release.set()
+        await billing._call("get_user_info", "alice", "md5-a")
+        await billing._call("get_user_info", "bob", "md5-b")
+        await billing._call("get_active_tariffs_vservices", "alice", "md5-a")
+        await billing._call("get_active_tariffs_vservices", "bob", "md5-b")
+        methods = [method for method, _ in fake.calls]
+        assert methods.count("get_active_tariffs_vservices") == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+"""Тесты TokenBucket."""
+
+from typing import Any
+
+import pytest
+
+from bot.middlewares.outbound import OutboundScheduler
+from bot.utils.ratelimit import TokenBucket
+
+
+def test_starts_full_and_refills(clock: Any) -> None:
+    """Корзина начинается полной и пополняется со скоростью rate."""
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == pytest.approx(0.5)
+
+    clock.advance(0.5)
+    assert bucket.try_take() == 0
+
+
+def test_capacity_caps_refill(clock: Any) -> None:
+    """Запас не превышает capacity даже после долгого простоя."""
+    bucket = TokenBucket(rate=1, capacity=3)
+    clock.advance(100)
+    for _ in range(3):
+        assert bucket.try_take() == 0
+    assert bucket.try_take() > 0
+
+
+def test_default_capacity_is_at_least_one() -> None:
+    """При rate < 1 корзина всё равно вмещает один токен."""
+    bucket = TokenBucket(rate=0.5)
+    assert bucket.try_take() == 0
+
+
+def test_reserve_keeps_tokens_for_others(clock: Any) -> None:
+    """С reserve токен берётся, только если после этого остаётся запас."""
+    bucket = TokenBucket(rate=10, capacity=10)
+    for _ in range(8):
+        assert bucket.try_take(reserve=2) == 0
+    assert bucket.try_take(reserve=2) == pytest.approx(0.1)
+    assert bucket.try_take() == 0
+
+
+def test_reserve_larger_than_capacity_fails_fast() -> None:
+    """Резерв, который не помещается в корзину, — ошибка, а не вечное ожидание."""
+    bucket = TokenBucket(rate=1)
+    with pytest.raises(ValueError):
+        bucket.try_take(reserve=0.5)
+
+
+def test_outbound_bucket_fits_bulk_reserve() -> None:
+    """При global_rate <= 1 массовая рассылка всё равно может взять токен."""
+    scheduler = OutboundScheduler(global_rate=1, bulk_reserve=0.5)
+    assert scheduler._global.try_take(reserve=scheduler._bulk_reserve) == 0
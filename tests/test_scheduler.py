@@ -0,0 +1,145 @@
+"""Тесты UpdateScheduler."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from bot.middlewares.scheduler import UpdateScheduler
+
+
+class Handler:
+    """Обработчик, который ждёт разрешения на завершение каждого события."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.finished: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def release(self, name: str) -> None:
+        self.gates.setdefault(name, asyncio.Event()).set()
+
+    async def __call__(self, event: str, data: dict[str, Any]) -> str:
+        self.started.append(event)
+        await self.gates.setdefault(event, asyncio.Event()).wait()
+        self.finished.append(event)
+        return event
+
+
+def _data(user_id: int | None) -> dict[str, Any]:
+    return {"event_from_user": SimpleNamespace(id=user_id) if user_id is not None else None}
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_same_user_updates_run_in_order() -> None:
+    """Второе обновление пользователя ждёт завершения первого."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=10), Handler()
+        first = asyncio.create_task(scheduler(handler, "a1", _data(1)))
+        second = asyncio.create_task(scheduler(handler, "a2", _data(1)))
+        await _settle()
+        assert handler.started == ["a1"]
+        assert scheduler.queue_depth == 1
+
+        handler.release("a2")
+        handler.release("a1")
+        assert await asyncio.gather(first, second) == ["a1", "a2"]
+        assert handler.finished == ["a1", "a2"]
+        assert scheduler.queue_depth == 0
+        assert scheduler.in_progress == 0
+
+    asyncio.run(scenario())
+
+
+def test_different_users_run_concurrently() -> None:
+    """Обновления разных пользователей не ждут друг друга."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=10), Handler()
+        tasks = [asyncio.create_task(scheduler(handler, f"u{i}", _data(i))) for i in range(3)]
+        await _settle()
+        assert sorted(handler.started) == ["u0", "u1", "u2"]
+        assert scheduler.in_progress == 3
+        for i in range(3):
+            handler.release(f"u{i}")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_limit() -> None:
+    """Сверх concurrency обновления ждут свободного слота."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=1), Handler()
+        first = asyncio.create_task(scheduler(handler, "a", _data(1)))
+        second = asyncio.create_task(scheduler(handler, "b", _data(2)))
+        await _settle()
+        assert handler.started == ["a"]
+        handler.release("a")
+        handler.release("b")
+        await asyncio.gather(first, second)
+        assert handler.finished == ["a", "b"]
+
+    asyncio.run(scenario())
+
+
+def test_user_queue_limit_rejects_extra_updates() -> None:
+    """Обновление сверх max_user_queued ожидающих отбрасывается без обработчика."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=10, max_user_queued=1), Handler()
+        running = asyncio.create_task(scheduler(handler, "a1", _data(1)))
+        waiting = asyncio.create_task(scheduler(handler, "a2", _data(1)))
+        await _settle()
+
+        assert await scheduler(handler, "a3", _data(1)) is None
+        assert "a3" not in handler.started
+
+        for name in ("a1", "a2"):
+            handler.release(name)
+        await asyncio.gather(running, waiting)
+
+    asyncio.run(scenario())
+
+
+def test_global_queue_limit_rejects_extra_updates() -> None:
+    """Обновление сверх max_queued ожидающих отбрасывается."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=1, max_queued=1), Handler()
+        running = asyncio.create_task(scheduler(handler, "a", _data(1)))
+        waiting = asyncio.create_task(scheduler(handler, "b", _data(2)))
+        await _settle()
+
+        assert await scheduler(handler, "c", _data(3)) is None
+        assert handler.started == ["a"]
+
+        handler.release("a")
+        handler.release("b")
+        await asyncio.gather(running, waiting)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_releases_its_place() -> None:
+    """Отменённое в очереди обновление не оставляет за собой счётчиков."""
+
+    async def scenario() -> None:
+        scheduler, handler = UpdateScheduler(concurrency=10), Handler()
+        running = asyncio.create_task(scheduler(handler, "a1", _data(1)))
+        waiting = asyncio.create_task(scheduler(handler, "a2", _data(1)))
+        await _settle()
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queue_depth == 0
+
+        handler.release("a1")
+        await running
+        assert scheduler._users == {}
+
+    asyncio.run(scenario())
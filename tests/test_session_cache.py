@@ -0,0 +1,70 @@
+"""Тесты SessionCache."""
+
+from types import SimpleNamespace
+from typing import Any
+
+from bot.db.session_cache import MISSING, SessionCache
+
+
+def _session(locale: str = "uk") -> Any:
+    return SimpleNamespace(login="alice", locale=locale)
+
+
+def test_miss_hit_and_cached_absence() -> None:
+    """Кэш различает промах, сессию и запомненное отсутствие сессии."""
+    cache = SessionCache()
+    assert cache.get(1) is MISSING
+
+    session = _session()
+    cache.set(1, session)
+    cache.set(2, None)
+
+    assert cache.get(1) is session
+    assert cache.get(2) is None
+
+
+def test_entries_expire_before_locale(clock: Any) -> None:
+    """Сессия живёт ttl, а локаль пользователя — дольше, locale_ttl."""
+    cache = SessionCache(ttl=60, locale_ttl=3600)
+    cache.set(1, _session("en"))
+
+    clock.advance(61)
+    assert cache.get(1) is MISSING
+    assert cache.get_locale(1) == "en"
+
+    clock.advance(3600)
+    assert cache.get_locale(1) is None
+
+
+def test_lru_eviction() -> None:
+    """Сверх max_size вытесняется давно не использованная запись."""
+    cache = SessionCache(max_size=2)
+    cache.set(1, _session())
+    cache.set(2, _session())
+    cache.get(1)
+    cache.set(3, _session())
+
+    assert cache.get(2) is MISSING
+    assert cache.get(1) is not MISSING
+    assert cache.get(3) is not MISSING
+
+
+def test_invalidate_reads_from_primary_for_a_while(clock: Any) -> None:
+    """После invalidate() сессия какое-то время читается из основной БД."""
+    cache = SessionCache(primary_read_delay=5)
+    cache.set(1, _session())
+
+    cache.invalidate(1)
+
+    assert cache.get(1) is MISSING
+    assert cache.read_from_primary(1)
+    clock.advance(5)
+    assert not cache.read_from_primary(1)
+
+
+def test_zero_ttl_keeps_only_locale() -> None:
+    """При ttl=0 сессии не кэшируются, но локаль запоминается."""
+    cache = SessionCache(ttl=0)
+    cache.set(1, _session("en"))
+    assert cache.get(1) is MISSING
+    assert cache.get_locale(1) == "en"
@@ -0,0 +1,109 @@
+"""Тесты шардирования и обработки стримов Redis."""
+
+import asyncio
+import json
+from typing import Any
+
+from bot.streams import ShardConsumer, sender_id, shard_for
+
+
+def _message(update_id: int, user_id: int) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+            "text": str(update_id),
+        },
+    }
+
+
+def test_sender_id() -> None:
+    """Отправитель берётся из from, user или chat события."""
+    assert sender_id(_message(1, 42)) == 42
+    assert sender_id({"update_id": 1, "my_chat_member": {"chat": {"id": 7}}}) == 7
+    assert sender_id({"update_id": 1}) is None
+
+
+def test_shard_for_keeps_user_on_one_shard() -> None:
+    """Обновления пользователя попадают в один шард; без отправителя — по update_id."""
+    assert shard_for(_message(1, 42), 16) == shard_for(_message(2, 42), 16) == 42 % 16
+    assert shard_for({"update_id": 35}, 16) == 35 % 16
+
+
+class FakeDispatcher:
+    """Dispatcher, обработка обновления которого ждёт release."""
+
+    def __init__(self) -> None:
+        self.started: list[int] = []
+        self.gates: dict[int, asyncio.Event] = {}
+
+    def release(self, update_id: int) -> None:
+        self.gates.setdefault(update_id, asyncio.Event()).set()
+
+    async def feed_update(self, bot: Any, update: Any) -> None:
+        self.started.append(update.update_id)
+        await self.gates.setdefault(update.update_id, asyncio.Event()).wait()
+
+
+def _entries(*updates: Any) -> list[tuple[bytes, dict[bytes, bytes]]]:
+    entries = []
+    for index, update in enumerate(updates, 1):
+        raw = update if isinstance(update, bytes) else json.dumps(update).encode()
+        entries.append((f"{index}-0".encode(), {b"update": raw}))
+    return entries
+
+
+def test_consumer_orders_per_user_and_acks_each_entry(redis: Any) -> None:
+    """Обновления пользователя идут по очереди, разных — одновременно; каждое подтверждается."""
+
+    async def scenario() -> None:
+        dp = FakeDispatcher()
+        consumer = ShardConsumer(redis, None, dp, 0, "worker", asyncio.Semaphore(10))
+        await consumer._process(_entries(_message(1, 42), _message(2, 42), _message(3, 7)))
+        await asyncio.sleep(0)
+        assert dp.started == [1, 3]
+
+        dp.release(3)
+        await asyncio.sleep(0)
+        assert redis.acked == [b"3-0"]
+
+        dp.release(1)
+        dp.release(2)
+        await consumer._wait_idle()
+        assert dp.started == [1, 3, 2]
+        assert redis.acked == [b"3-0", b"1-0", b"2-0"]
+
+    asyncio.run(scenario())
+
+
+def test_consumer_skips_and_acks_broken_entries(redis: Any) -> None:
+    """Сообщение не в JSON подтверждается без обработки."""
+
+    async def scenario() -> None:
+        dp = FakeDispatcher()
+        consumer = ShardConsumer(redis, None, dp, 0, "worker", asyncio.Semaphore(10))
+        await consumer._process(_entries(b"{not json"))
+        await consumer._wait_idle()
+        assert dp.started == []
+        assert redis.acked == [b"1-0"]
+
+    asyncio.run(scenario())
+
+
+def test_consumer_close_leaves_unfinished_entries_unacked(redis: Any) -> None:
+    """close() отменяет незавершённые обновления, не подтверждая их."""
+
+    async def scenario() -> None:
+        dp = FakeDispatcher()
+        slots = asyncio.Semaphore(10)
+        consumer = ShardConsumer(redis, None, dp, 0, "worker", slots)
+        await consumer._process(_entries(_message(1, 42)))
+        await asyncio.sleep(0)
+        await consumer.close()
+        assert redis.acked == []
+        assert slots._value == 10
+
+    asyncio.run(scenario())